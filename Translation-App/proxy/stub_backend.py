@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+from aiohttp import web
+
+
+REQUESTS_KEY = web.AppKey('requests', list)
+
+
+def fake_translate(text, source, target):
+    return f"[{source}->{target}] {text}"
+
+
+def create_stub_app(delay=0.0, unsupported=('xx',)):
+    """Minimal LibreTranslate stand-in for tests and offline development.
+
+    Translations are deterministic (`fake_translate`), every request body is
+    recorded in `app[REQUESTS_KEY]`, and targets in `unsupported` fail with
+    HTTP 400 like the real service does.
+    """
+    app = web.Application()
+    app[REQUESTS_KEY] = []
+
+    async def translate(request):
+        body = await request.json()
+        request.app[REQUESTS_KEY].append(body)
+        if delay:
+            await asyncio.sleep(delay)
+        if body.get('target') in unsupported:
+            return web.json_response({'error': f"{body['target']} is not supported"}, status=400)
+
+        q = body['q']
+        if isinstance(q, list):
+            translated = [fake_translate(t, body['source'], body['target']) for t in q]
+        else:
+            translated = fake_translate(q, body['source'], body['target'])
+        return web.json_response({'translatedText': translated})
+
+    app.router.add_post('/translate', translate)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stub LibreTranslate backend')
+    parser.add_argument('--port', type=int, default=5002)
+    parser.add_argument('--delay', type=float, default=0.2,
+                       help='Simulated translation latency in seconds')
+
+    args = parser.parse_args()
+    web.run_app(create_stub_app(delay=args.delay), host='127.0.0.1', port=args.port)
+
+
+if __name__ == '__main__':
+    main()
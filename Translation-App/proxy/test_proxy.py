@@ -0,0 +1,122 @@
+import asyncio
+import time
+from aiohttp.test_utils import TestClient, TestServer
+from stub_backend import REQUESTS_KEY, create_stub_app, fake_translate
+from translate_proxy import TranslationCache, TranslationProxy, create_app
+
+
+async def start_proxy(stub_app, cache=None, **kwargs):
+    backend = TestServer(stub_app)
+    await backend.start_server()
+    proxy = TranslationProxy(str(backend.make_url('/translate')), cache, **kwargs)
+    client = TestClient(TestServer(create_app(proxy, save_interval=3600)))
+    await client.start_server()
+    return backend, client
+
+
+async def post(client, text, source='en', target='es'):
+    response = await client.post('/translate', json={'q': text, 'source': source, 'target': target,
+                                                     'format': 'text'})
+    return response.status, await response.json()
+
+
+def test_repeated_text_served_from_cache():
+    async def run():
+        stub = create_stub_app()
+        backend, client = await start_proxy(stub)
+        try:
+            for _ in range(3):
+                status, body = await post(client, "Hello world")
+                assert status == 200
+                assert body['translatedText'] == fake_translate("Hello world", 'en', 'es')
+            await post(client, "Hello world", target='fr')
+        finally:
+            await client.close()
+            await backend.close()
+        assert len(stub[REQUESTS_KEY]) == 2
+
+    asyncio.run(run())
+
+
+def test_identical_concurrent_requests_coalesced():
+    async def run():
+        stub = create_stub_app(delay=0.1)
+        backend, client = await start_proxy(stub)
+        try:
+            results = await asyncio.gather(*(post(client, "Good morning") for _ in range(20)))
+        finally:
+            await client.close()
+            await backend.close()
+        assert all(body['translatedText'] == fake_translate("Good morning", 'en', 'es')
+                   for _, body in results)
+        assert len(stub[REQUESTS_KEY]) == 1
+
+    asyncio.run(run())
+
+
+def test_distinct_texts_batched():
+    async def run():
+        stub = create_stub_app()
+        backend, client = await start_proxy(stub, batch_window=0.05, max_batch=4)
+        texts = [f"sentence {i}" for i in range(10)]
+        try:
+            results = await asyncio.gather(*(post(client, t) for t in texts))
+        finally:
+            await client.close()
+            await backend.close()
+        assert [body['translatedText'] for _, body in results] == \
+            [fake_translate(t, 'en', 'es') for t in texts]
+        assert len(stub[REQUESTS_KEY]) == 3
+        assert all(len(r['q']) <= 4 for r in stub[REQUESTS_KEY] if isinstance(r['q'], list))
+
+    asyncio.run(run())
+
+
+def test_upstream_error_not_cached():
+    async def run():
+        stub = create_stub_app()
+        backend, client = await start_proxy(stub)
+        try:
+            for _ in range(2):
+                status, body = await post(client, "Hello", target='xx')
+                assert status == 400
+                assert 'error' in body
+        finally:
+            await client.close()
+            await backend.close()
+        assert len(stub[REQUESTS_KEY]) == 2
+
+    asyncio.run(run())
+
+
+def test_cache_lru_and_ttl():
+    cache = TranslationCache(max_entries=2, ttl=0.05)
+    cache.put(('en', 'es', 'text', 'a'), 'A')
+    cache.put(('en', 'es', 'text', 'b'), 'B')
+    cache.get(('en', 'es', 'text', 'a'))
+    cache.put(('en', 'es', 'text', 'c'), 'C')
+
+    assert cache.get(('en', 'es', 'text', 'b')) is None
+    assert cache.get(('en', 'es', 'text', 'a')) == 'A'
+
+    time.sleep(0.1)
+    assert cache.get(('en', 'es', 'text', 'a')) is None
+    assert len(cache) == 1
+
+
+def test_cache_persists_between_runs(tmp_path):
+    path = str(tmp_path / 'cache.json')
+
+    async def run(cache):
+        stub = create_stub_app()
+        backend, client = await start_proxy(stub, cache)
+        try:
+            status, body = await post(client, "Thank you")
+        finally:
+            await client.close()
+            await backend.close()
+        assert body['translatedText'] == fake_translate("Thank you", 'en', 'es')
+        return len(stub[REQUESTS_KEY])
+
+    assert asyncio.run(run(TranslationCache(path))) == 1
+    assert asyncio.run(run(TranslationCache(path))) == 0
@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+import aiohttp
+from aiohttp import web
+
+
+class UpstreamError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TranslationCache:
+    """LRU cache of translations with a per-entry time to live.
+
+    Keys are (source, target, format, text) tuples. Expiry uses wall-clock
+    time so entries saved to `path` keep their remaining lifetime across
+    restarts; expired entries are dropped on lookup and on load.
+    """
+
+    def __init__(self, path=None, max_entries=10000, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.dirty = False
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.time() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.dirty = True
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            rows = json.load(f)
+        now = time.time()
+        # Rows are stored oldest first, so re-inserting them restores LRU order
+        for source, target, fmt, text, value, expires_at in rows:
+            if expires_at > now:
+                self._entries[(source, target, fmt, text)] = (expires_at, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        if not self.path:
+            return
+        rows = [[*key, value, expires_at] for key, (expires_at, value) in self._entries.items()]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+class TranslationProxy:
+    """Caching, coalescing and batching client for a LibreTranslate backend.
+
+    A text that is already being translated is not requested again; later
+    callers await the same future. Cache misses for the same language pair
+    arriving within `batch_window` seconds are sent as one request (`q` as
+    a list, up to `max_batch` texts). Upstream requests share one pooled
+    aiohttp session, so connections are kept alive between requests.
+    """
+
+    def __init__(self, upstream_url, cache=None, api_key=None, max_connections=20,
+                 batch_window=0.01, max_batch=32, timeout=15):
+        self.upstream_url = upstream_url
+        self.cache = cache if cache is not None else TranslationCache()
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.session = None
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'upstream_requests': 0,
+                      'upstream_errors': 0}
+
+        self._inflight = {}
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def close(self):
+        for group in list(self._pending):
+            self._flush(group)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def translate(self, text, source, target, fmt='text'):
+        if not text.strip():
+            return text
+
+        key = (source, target, fmt, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['misses'] += 1
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._enqueue((source, target, fmt), text)
+        # Shielded so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(future)
+
+    def _enqueue(self, group, text):
+        batch = self._pending.setdefault(group, [])
+        batch.append(text)
+        if len(batch) >= self.max_batch:
+            self._flush(group)
+        elif len(batch) == 1:
+            self._timers[group] = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush, group)
+
+    def _flush(self, group):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        texts = self._pending.pop(group, None)
+        if not texts:
+            return
+        task = asyncio.ensure_future(self._send(group, texts))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, group, texts):
+        source, target, fmt = group
+        try:
+            translations = await self._request(texts, source, target, fmt)
+        except Exception as exc:
+            self.stats['upstream_errors'] += 1
+            if not isinstance(exc, UpstreamError):
+                exc = UpstreamError(502, f"Translation backend unavailable: {exc}")
+            for text in texts:
+                future = self._inflight.pop((source, target, fmt, text))
+                if not future.done():
+                    future.set_exception(exc)
+                    # Avoid "exception never retrieved" if every caller went away
+                    future.exception()
+            return
+
+        for text, translated in zip(texts, translations):
+            key = (source, target, fmt, text)
+            self.cache.put(key, translated)
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(translated)
+
+    async def _request(self, texts, source, target, fmt):
+        payload = {
+            'q': texts if len(texts) > 1 else texts[0],
+            'source': source,
+            'target': target,
+            'format': fmt,
+        }
+        if self.api_key:
+            payload['api_key'] = self.api_key
+
+        self.stats['upstream_requests'] += 1
+        async with self.session.post(self.upstream_url, json=payload) as response:
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = {}
+            if response.status != 200:
+                raise UpstreamError(response.status, data.get('error', 'Translation service error'))
+
+        translated = data.get('translatedText')
+        if isinstance(translated, str):
+            translated = [translated]
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise UpstreamError(502, 'Unexpected response from translation backend')
+        return translated
+
+
+PROXY_KEY = web.AppKey('proxy', TranslationProxy)
+ALLOW_ORIGIN_KEY = web.AppKey('allow_origin', str)
+SAVER_KEY = web.AppKey('saver', asyncio.Task)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    # The React dev server runs on another origin
+    if request.method == 'OPTIONS':
+        response = web.Response()
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = request.app[ALLOW_ORIGIN_KEY]
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    return response
+
+
+async def handle_translate(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        return web.json_response({'error': 'Invalid JSON body'}, status=400)
+
+    q = body.get('q')
+    source = body.get('source', 'auto')
+    target = body.get('target')
+    fmt = body.get('format', 'text')
+    texts = q if isinstance(q, list) else [q]
+    if not target or not texts or not all(isinstance(t, str) for t in texts):
+        return web.json_response({'error': 'Expected "q" (string or list) and "target"'}, status=400)
+
+    proxy = request.app[PROXY_KEY]
+    try:
+        results = await asyncio.gather(*(proxy.translate(t, source, target, fmt) for t in texts))
+    except UpstreamError as exc:
+        return web.json_response({'error': exc.message}, status=exc.status)
+    return web.json_response({'translatedText': results if isinstance(q, list) else results[0]})
+
+
+async def handle_stats(request):
+    proxy = request.app[PROXY_KEY]
+    return web.json_response({**proxy.stats, 'cache_entries': len(proxy.cache)})
+
+
+async def save_periodically(cache, interval):
+    while True:
+        await asyncio.sleep(interval)
+        if cache.dirty:
+            cache.save()
+
+
+def create_app(proxy, allow_origin='*', save_interval=30):
+    app = web.Application(middlewares=[cors_middleware])
+    app[PROXY_KEY] = proxy
+    app[ALLOW_ORIGIN_KEY] = allow_origin
+    app.router.add_post('/translate', handle_translate)
+    app.router.add_get('/stats', handle_stats)
+
+    async def on_startup(app):
+        proxy.cache.load()
+        await proxy.start()
+        app[SAVER_KEY] = asyncio.ensure_future(save_periodically(proxy.cache, save_interval))
+
+    async def on_cleanup(app):
+        app[SAVER_KEY].cancel()
+        await proxy.close()
+        proxy.cache.save()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Caching translation proxy for LibreTranslate')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--upstream', type=str, default='https://libretranslate.com/translate',
+                       help='LibreTranslate-compatible /translate endpoint')
+    parser.add_argument('--api-key', type=str, default=os.environ.get('LIBRETRANSLATE_API_KEY'),
+                       help='Upstream API key (default: $LIBRETRANSLATE_API_KEY)')
+    parser.add_argument('--cache-file', type=str, default='translation_cache.json',
+                       help='Where the cache is persisted (empty to keep it in memory only)')
+    parser.add_argument('--cache-size', type=int, default=10000,
+                       help='Maximum number of cached translations')
+    parser.add_argument('--ttl', type=float, default=7 * 24 * 3600,
+                       help='Seconds a cached translation stays valid')
+    parser.add_argument('--max-connections', type=int, default=20,
+                       help='Size of the upstream connection pool')
+    parser.add_argument('--batch-window', type=float, default=0.01,
+                       help='Seconds to wait for more texts before sending a batch')
+    parser.add_argument('--max-batch', type=int, default=32,
+                       help='Texts per upstream request (1 for backends without list support)')
+    parser.add_argument('--allow-origin', type=str, default='*')
+
+    args = parser.parse_args()
+
+    cache = TranslationCache(args.cache_file or None, max_entries=args.cache_size, ttl=args.ttl)
+    proxy = TranslationProxy(args.upstream, cache, api_key=args.api_key,
+                             max_connections=args.max_connections,
+                             batch_window=args.batch_window, max_batch=args.max_batch)
+
+    print(f"Proxying {args.upstream} on http://{args.host}:{args.port}/translate")
+    web.run_app(create_app(proxy, allow_origin=args.allow_origin),
+                host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
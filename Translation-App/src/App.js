@@ -1,6 +1,10 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Copy, Volume2, RefreshCw, Sparkles, Zap, Brain, Trash2, Moon, Sun } from 'lucide-react';
 
+// Set REACT_APP_TRANSLATE_URL (e.g. http://localhost:5001/translate) to go
+// through the caching proxy in proxy/
+const TRANSLATE_URL = process.env.REACT_APP_TRANSLATE_URL || 'https://libretranslate.com/translate';
+
 function App() {
   const [sourceText, setSourceText] = useState('');
   const [translatedText, setTranslatedText] = useState('');
@@ -51,7 +55,7 @@ function App() {
   // LibreTranslate API - Much better than MyMemory!
   const translateWithAPI = async (text, source, target) => {
     try {
-      const response = await fetch('https://libretranslate.com/translate', {
+      const response = await fetch(TRANSLATE_URL, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -1,86 +1,13 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import json
-import re
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-
-class FAQChatbot:
-
-    def __init__(self, faq_data, similarity_threshold=0.3):
-        self.faq_data = faq_data
-        self.similarity_threshold = similarity_threshold
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-
-        self.questions = [faq['question'] for faq in faq_data]
-        self.answers = [faq['answer'] for faq in faq_data]
-
-        self.preprocessed_questions = [self.preprocess_text(q) for q in self.questions]
-
-        self.vectorizer = TfidfVectorizer()
-        self.question_vectors = self.vectorizer.fit_transform(self.preprocessed_questions)
-
-    def preprocess_text(self, text):
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        tokens = word_tokenize(text)
-        processed_tokens = [
-            self.lemmatizer.lemmatize(token)
-            for token in tokens
-            if token not in self.stop_words and len(token) > 2
-        ]
-        return ' '.join(processed_tokens)
-
-    def find_best_match(self, user_question):
-        processed_question = self.preprocess_text(user_question)
-        user_vector = self.vectorizer.transform([processed_question])
-        similarities = cosine_similarity(user_vector, self.question_vectors)
-
-        best_match_idx = np.argmax(similarities[0])
-        best_similarity = similarities[0][best_match_idx]
-
-        if best_similarity >= self.similarity_threshold:
-            return (
-                self.answers[best_match_idx],
-                best_similarity,
-                self.questions[best_match_idx]
-            )
-        else:
-            return (
-                "Sorry, I don't understand your question. Please try rephrasing or contact our support team for assistance.",
-                best_similarity,
-                None
-            )
-
-    def get_response(self, user_question):
-        answer, confidence, matched_q = self.find_best_match(user_question)
-        return {
-            'answer': answer,
-            'confidence': round(confidence * 100, 2),
-            'matched_question': matched_q
-        }
+import chatbot_cli
+
+
+class FAQChatbot(chatbot_cli.FAQChatbot):
+    """The shared matcher from chatbot_cli, with the web app's wording."""
+
+    fallback_message = "Sorry, I don't understand your question. Please try rephrasing or contact our support team for assistance."
 
 
 def load_faq_data():
@@ -149,6 +76,12 @@ def load_faq_data():
     return faq_data
 
 
+@st.cache_resource
+def get_chatbot():
+    # One shared, read-only instance serves every session's thread
+    return FAQChatbot(load_faq_data(), spell_correction=True, spell_index=chatbot_cli.SPELL_INDEX)
+
+
 def main():
     st.set_page_config(
         page_title="FAQ Chatbot",
@@ -170,8 +103,7 @@ def main():
     st.markdown('<p class="sub-header">E-commerce Customer Support Assistant</p>', unsafe_allow_html=True)
 
     if 'chatbot' not in st.session_state:
-        faq_data = load_faq_data()
-        st.session_state.chatbot = FAQChatbot(faq_data)
+        st.session_state.chatbot = get_chatbot()
         st.session_state.chat_history = []
 
     with st.sidebar:
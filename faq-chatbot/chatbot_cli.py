@@ -4,7 +4,11 @@ from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from hashing_tfidf import HashingTfidfVectorizer
+from spelling import load_or_build
 import numpy as np
+import argparse
+import os
 import re
 import json
 
@@ -19,9 +23,23 @@ def download_nltk_data():
 
 download_nltk_data()
 
+# Default on-disk spelling index, rebuilt whenever the FAQ questions change
+SPELL_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'spelling_index.json')
 
-class FAQChatbot:    
-    def __init__(self, faq_data, similarity_threshold=0.3):
+
+class FAQChatbot:
+    """TF-IDF FAQ matcher.
+
+    A single instance can be shared between threads: once constructed,
+    get_response only reads the fitted vectorizer, question vectors and
+    stopword set. Construction warms up NLTK's lazily loaded resources,
+    since loading those from several threads at once is not safe.
+    """
+    
+    fallback_message = "Sorry, I don't understand your question. Please try rephrasing or type 'help' for assistance."
+
+    def __init__(self, faq_data, similarity_threshold=0.3, engine='tfidf', n_features=2 ** 18,
+                 alternate_sign=False, spell_correction=False, spell_index=None):
        
         self.faq_data = faq_data
         self.similarity_threshold = similarity_threshold
@@ -31,39 +49,103 @@ class FAQChatbot:
         self.questions = [faq['question'] for faq in faq_data]
         self.answers = [faq['answer'] for faq in faq_data]
         
+        self.speller = None
+        if spell_correction:
+            print("Building spelling index...")
+            self.speller = load_or_build(self.questions, self.tokenize, spell_index)
+        
         print("Preprocessing FAQ data...")
         self.preprocessed_questions = [self.preprocess_text(q) for q in self.questions]
         
         print("Creating TF-IDF vectors...")
-        self.vectorizer = TfidfVectorizer()
+        # 'hashing' keeps memory fixed for large or fast-changing vocabularies
+        if engine == 'hashing':
+            self.vectorizer = HashingTfidfVectorizer(n_features=n_features,
+                                                     alternate_sign=alternate_sign)
+        elif engine == 'tfidf':
+            self.vectorizer = TfidfVectorizer()
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
         self.question_vectors = self.vectorizer.fit_transform(self.preprocessed_questions)
+        self.warm_up()
         print("Chatbot ready!\n")
+    
+    def warm_up(self):
+        # WordNet and the punkt tokenizer load on first use. Triggering that
+        # here keeps the first request fast and avoids concurrent lazy loads.
+        self.find_best_match("warm up query")
+        
+    def tokenize(self, text):
         
-    def preprocess_text(self, text):
-       
         text = text.lower()
         
         text = re.sub(r'[^a-zA-Z\s]', '', text)
         
         tokens = word_tokenize(text)
         
-        processed_tokens = [
-            self.lemmatizer.lemmatize(token)
-            for token in tokens
-            if token not in self.stop_words and len(token) > 2
-        ]
+        return [token for token in tokens if token not in self.stop_words and len(token) > 2]
+        
+    def preprocess_text(self, text, correct_spelling=False):
+        
+        tokens = self.tokenize(text)
+        
+        # Fix typos against the FAQ question vocabulary before lemmatizing
+        if correct_spelling:
+            tokens = [self.speller.correct(token) for token in tokens]
+        
+        processed_tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
         
         return ' '.join(processed_tokens)
     
-    def find_best_match(self, user_question):
-        processed_question = self.preprocess_text(user_question)
+    def add_faqs(self, faqs):
+        """Adds FAQ entries to a built chatbot.
+
+        The hashing engine updates its IDF with partial_fit; the vocabulary
+        engine has to be refitted. Either way the IDF of existing terms
+        changes, so all question vectors are recomputed. Not safe to call
+        while other threads are answering questions.
+        """
+        faqs = list(faqs)
+        questions = [faq['question'] for faq in faqs]
+        if self.speller is not None:
+            self.speller.add_words(token for q in questions for token in self.tokenize(q))
+        preprocessed = [self.preprocess_text(q) for q in questions]
+        
+        self.faq_data = self.faq_data + faqs
+        self.questions = self.questions + questions
+        self.answers = self.answers + [faq['answer'] for faq in faqs]
+        self.preprocessed_questions = self.preprocessed_questions + preprocessed
         
+        if isinstance(self.vectorizer, HashingTfidfVectorizer):
+            self.vectorizer.partial_fit(preprocessed)
+            self.question_vectors = self.vectorizer.transform(self.preprocessed_questions)
+        else:
+            self.question_vectors = self.vectorizer.fit_transform(self.preprocessed_questions)
+    
+    def score(self, processed_question):
         user_vector = self.vectorizer.transform([processed_question])
         
         similarities = cosine_similarity(user_vector, self.question_vectors)
         
         best_match_idx = np.argmax(similarities[0])
-        best_similarity = similarities[0][best_match_idx]
+        return best_match_idx, similarities[0][best_match_idx]
+    
+    def best_match(self, user_question):
+        """Returns the index of the closest FAQ question and its similarity."""
+        best_match_idx, best_similarity = self.score(self.preprocess_text(user_question))
+        
+        # Spelling correction only gets a say when the query as typed has no
+        # good match, so it cannot override a confident answer
+        if self.speller is not None and best_similarity < self.similarity_threshold:
+            corrected_idx, corrected_similarity = self.score(
+                self.preprocess_text(user_question, correct_spelling=True))
+            if corrected_similarity > best_similarity:
+                best_match_idx, best_similarity = corrected_idx, corrected_similarity
+        
+        return best_match_idx, best_similarity
+    
+    def find_best_match(self, user_question):
+        best_match_idx, best_similarity = self.best_match(user_question)
         
         if best_similarity >= self.similarity_threshold:
             return (
@@ -73,7 +155,7 @@ class FAQChatbot:
             )
         else:
             return (
-                "Sorry, I don't understand your question. Please try rephrasing or type 'help' for assistance.",
+                self.fallback_message,
                 best_similarity,
                 None
             )
@@ -206,10 +288,20 @@ def display_response(response):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='FAQ chatbot for the command line')
+    parser.add_argument('--no-spell-correction', action='store_true',
+                       help='Answer queries exactly as typed, without fixing typos')
+    parser.add_argument('--spell-index', type=str, default=SPELL_INDEX,
+                       help='Where the spelling index is kept between runs')
+    
+    args = parser.parse_args()
+    
     print_header()
     
     faq_data = load_faq_data()
-    chatbot = FAQChatbot(faq_data, similarity_threshold=0.3)
+    chatbot = FAQChatbot(faq_data, similarity_threshold=0.3,
+                         spell_correction=not args.no_spell_correction,
+                         spell_index=args.spell_index)
     
     while True:
         user_input = input("YOU: ").strip()
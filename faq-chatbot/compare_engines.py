@@ -0,0 +1,65 @@
+import argparse
+import pickle
+import string
+import time
+import numpy as np
+from chatbot_cli import FAQChatbot, load_faq_data
+from evaluate import evaluate, load_queries
+
+
+def add_catalog_entries(faq_data, count, seed=0):
+    # Entries made of random alphabetic tokens stand in for SKUs and product
+    # names: each one grows the vocabulary without matching real queries.
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_lowercase))
+    expanded = list(faq_data)
+    for i in range(count):
+        tokens = [''.join(rng.choice(letters, size=8)) for _ in range(4)]
+        expanded.append({'question': ' '.join(tokens), 'answer': f"Catalog entry {i}"})
+    return expanded
+
+
+def measure(faq_data, engine, n_features, alternate_sign=False, queries=None):
+    start = time.perf_counter()
+    chatbot = FAQChatbot(faq_data, engine=engine, n_features=n_features,
+                         alternate_sign=alternate_sign)
+    build_time = time.perf_counter() - start
+
+    result = {
+        'engine': engine,
+        'faqs': len(faq_data),
+        'build_s': build_time,
+        'vectorizer_kb': len(pickle.dumps(chatbot.vectorizer)) / 1024,
+    }
+    if queries is not None:
+        scores = evaluate(chatbot, queries)
+        result['top1_accuracy'] = scores['top1_accuracy']
+        result['queries_per_second'] = scores['queries_per_second']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare vocabulary and hashing TF-IDF engines')
+    parser.add_argument('--queries', type=str, default='data/eval_queries.csv',
+                       help='Labeled query file used for accuracy')
+    parser.add_argument('--catalog-sizes', type=str, default='0,10000,100000',
+                       help='Numbers of synthetic catalog entries to add to the FAQ set')
+    parser.add_argument('--n-features', type=int, default=2 ** 18)
+    parser.add_argument('--alternate-sign', action='store_true',
+                       help='Use signed hashing for the hashing engine')
+
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    print(f"{'Engine':8s} {'FAQs':>7s} {'Build s':>8s} {'Pickle KB':>10s} {'Top-1':>7s} {'q/s':>10s}")
+    print("-" * 56)
+    for size in [int(n) for n in args.catalog_sizes.split(',')]:
+        faq_data = add_catalog_entries(load_faq_data(), size)
+        for engine in ('tfidf', 'hashing'):
+            r = measure(faq_data, engine, args.n_features, args.alternate_sign, queries)
+            print(f"{r['engine']:8s} {r['faqs']:7d} {r['build_s']:8.2f} {r['vectorizer_kb']:10.1f} "
+                  f"{r['top1_accuracy'] * 100:6.1f}% {r['queries_per_second']:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+from chatbot_cli import FAQChatbot, load_faq_data
+
+
+def load_queries(path):
+    """Reads a labeled query set from CSV or JSON Lines.
+
+    Expects a `query` column and an `expected` column holding the FAQ
+    question the query should match; leave `expected` empty for queries
+    that should fall back (out of scope).
+    """
+    if path.endswith('.jsonl'):
+        df = pd.read_json(path, lines=True, dtype={'expected': str})
+    else:
+        df = pd.read_csv(path, dtype={'query': str, 'expected': str}, keep_default_na=False)
+    df['expected'] = df['expected'].fillna('').astype(str).str.strip()
+    return df
+
+
+def expected_indices(chatbot, expected):
+    index = {q.strip().lower(): i for i, q in enumerate(chatbot.questions)}
+    labels = np.full(len(expected), -1, dtype=np.int64)
+    unknown = set()
+    for row, question in enumerate(expected):
+        if not question:
+            continue
+        i = index.get(question.lower())
+        if i is None:
+            unknown.add(question)
+        else:
+            labels[row] = i
+    if unknown:
+        raise ValueError(f"Expected questions not in the FAQ set: {sorted(unknown)[:5]}")
+    return labels
+
+
+def top_k_matches(chatbot, processed, top_k, chunk_size):
+    vectors = chatbot.vectorizer.transform(processed)
+    k = min(top_k, len(chatbot.questions))
+    top_idx = np.empty((len(processed), k), dtype=np.int64)
+    top_sim = np.empty((len(processed), k), dtype=np.float64)
+    for start in range(0, len(processed), chunk_size):
+        sims = cosine_similarity(vectors[start:start + chunk_size], chatbot.question_vectors)
+        # A stable sort breaks ties by FAQ index, like np.argmax in FAQChatbot.score
+        order = np.argsort(-sims, axis=1, kind='stable')[:, :k]
+        top_idx[start:start + chunk_size] = order
+        top_sim[start:start + chunk_size] = np.take_along_axis(sims, order, axis=1)
+    return top_idx, top_sim
+
+
+def score_queries(chatbot, queries, top_k=3, chunk_size=10000):
+    """Scores all queries in one batched pass.
+
+    Returns the top-k FAQ indices and similarities per query. Each distinct
+    query is preprocessed once, all of them are vectorized together and
+    the similarity matrix is computed in row chunks to bound memory. With
+    spelling correction, queries below the threshold are rescored with
+    corrected text, as FAQChatbot.best_match does.
+    """
+    unique, inverse = np.unique(np.asarray(queries, dtype=object).astype(str), return_inverse=True)
+    top_idx, top_sim = top_k_matches(chatbot, [chatbot.preprocess_text(q) for q in unique],
+                                     top_k, chunk_size)
+
+    retry = np.flatnonzero(top_sim[:, 0] < chatbot.similarity_threshold)
+    if chatbot.speller is not None and len(retry):
+        corrected = [chatbot.preprocess_text(q, correct_spelling=True) for q in unique[retry]]
+        retry_idx, retry_sim = top_k_matches(chatbot, corrected, top_k, chunk_size)
+        better = retry_sim[:, 0] > top_sim[retry, 0]
+        top_idx[retry[better]] = retry_idx[better]
+        top_sim[retry[better]] = retry_sim[better]
+
+    return top_idx[inverse], top_sim[inverse]
+
+
+def threshold_sweep(top_idx, top_sim, labels, thresholds):
+    """Accuracy at every threshold, derived from the same similarity scores."""
+    best_sim = top_sim[:, 0]
+    in_scope = labels >= 0
+    top1_hit = top_idx[:, 0] == labels
+
+    accepted = best_sim[:, None] >= thresholds[None, :]
+    correct = np.where(in_scope[:, None], accepted & top1_hit[:, None], ~accepted)
+
+    rows = []
+    for j, threshold in enumerate(thresholds):
+        rows.append({
+            'threshold': round(float(threshold), 3),
+            'accuracy': float(correct[:, j].mean()),
+            'in_scope_accuracy': float(correct[in_scope, j].mean()) if in_scope.any() else None,
+            'out_of_scope_accuracy': float(correct[~in_scope, j].mean()) if (~in_scope).any() else None,
+        })
+    return rows
+
+
+def evaluate(chatbot, df, top_k=3, thresholds=None):
+    if thresholds is None:
+        thresholds = np.round(np.arange(0.0, 1.0001, 0.05), 3)
+
+    start = time.perf_counter()
+    top_idx, top_sim = score_queries(chatbot, df['query'].tolist(), top_k=top_k)
+    elapsed = time.perf_counter() - start
+
+    labels = expected_indices(chatbot, df['expected'].tolist())
+    in_scope = labels >= 0
+    sweep = threshold_sweep(top_idx, top_sim, labels, np.asarray(thresholds, dtype=np.float64))
+    at_threshold = threshold_sweep(top_idx, top_sim, labels,
+                                   np.array([chatbot.similarity_threshold]))[0]
+
+    return {
+        'queries': int(len(df)),
+        'in_scope': int(in_scope.sum()),
+        'top1_accuracy': at_threshold['accuracy'],
+        'top1_in_scope': float((top_idx[in_scope, 0] == labels[in_scope]).mean()) if in_scope.any() else None,
+        'top_k': int(top_idx.shape[1]),
+        'topk_in_scope': float((top_idx[in_scope] == labels[in_scope, None]).any(axis=1).mean())
+        if in_scope.any() else None,
+        'threshold': chatbot.similarity_threshold,
+        'best_threshold': max(sweep, key=lambda r: r['accuracy'])['threshold'],
+        'queries_per_second': round(len(df) / elapsed, 1),
+        'sweep': sweep,
+    }
+
+
+def print_report(results):
+    print("=" * 70)
+    print("FAQ MATCHING EVALUATION")
+    print("=" * 70)
+    print(f"Queries: {results['queries']} ({results['in_scope']} in scope)")
+    print(f"Throughput: {results['queries_per_second']:.1f} queries/s")
+    print()
+    print(f"Top-1 accuracy at threshold {results['threshold']}: {results['top1_accuracy'] * 100:.1f}%")
+    if results['top1_in_scope'] is not None:
+        print(f"Top-1 in scope (ignoring threshold): {results['top1_in_scope'] * 100:.1f}%")
+        print(f"Top-{results['top_k']} in scope (ignoring threshold): {results['topk_in_scope'] * 100:.1f}%")
+    print()
+    print(f"{'Threshold':>9s} {'Overall':>9s} {'In scope':>9s} {'Out of scope':>13s}")
+    print("-" * 44)
+    for row in results['sweep']:
+        fmt = lambda v: f"{v * 100:.1f}%" if v is not None else "-"
+        print(f"{row['threshold']:9.2f} {fmt(row['accuracy']):>9s} {fmt(row['in_scope_accuracy']):>9s} "
+              f"{fmt(row['out_of_scope_accuracy']):>13s}")
+    print()
+    print(f"Best threshold: {results['best_threshold']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched offline evaluation of FAQ matching')
+    parser.add_argument('queries', type=str,
+                       help='Labeled query file (.csv or .jsonl) with "query" and "expected" columns')
+    parser.add_argument('--faq', type=str, default=None,
+                       help='FAQ JSON file (defaults to the built-in FAQ data)')
+    parser.add_argument('--threshold', type=float, default=0.3,
+                       help='Similarity threshold used for the headline accuracy')
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--report', type=str, default=None,
+                       help='Optional path to write the results as JSON')
+    parser.add_argument('--spell-correction', action='store_true',
+                       help='Correct typos in queries against the FAQ vocabulary')
+
+    args = parser.parse_args()
+
+    if args.faq:
+        with open(args.faq) as f:
+            faq_data = json.load(f)
+    else:
+        faq_data = load_faq_data()
+
+    chatbot = FAQChatbot(faq_data, similarity_threshold=args.threshold,
+                         spell_correction=args.spell_correction)
+    results = evaluate(chatbot, load_queries(args.queries), top_k=args.top_k)
+    print_report(results)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingTfidfVectorizer:
+    """TF-IDF over hashed features instead of a vocabulary dict.
+
+    Terms are hashed into a fixed `n_features` space, so memory and pickle
+    size do not grow with the corpus vocabulary (SKUs, typos, product
+    names). Document frequencies are kept per hashed feature, which lets
+    `partial_fit` add documents incrementally. With `alternate_sign=True`,
+    colliding terms partly cancel out instead of always adding up.
+    """
+
+    def __init__(self, n_features=2 ** 18, alternate_sign=False, smooth_idf=True):
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+        self.smooth_idf = smooth_idf
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=alternate_sign,
+                                        norm=None)
+        self.doc_freq = np.zeros(n_features, dtype=np.int32)
+        self.n_docs = 0
+        self.idf_ = np.zeros(n_features, dtype=np.float32)
+
+    def partial_fit(self, documents):
+        counts = self.hasher.transform(documents)
+        counts.eliminate_zeros()
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self.n_docs += counts.shape[0]
+
+        # Same formula as sklearn's TfidfVectorizer. Features never seen while
+        # fitting get zero weight, matching how the vocabulary path ignores
+        # out-of-vocabulary terms.
+        smooth = 1 if self.smooth_idf else 0
+        df = self.doc_freq + smooth
+        idf = np.log((self.n_docs + smooth) / np.maximum(df, 1)) + 1
+        self.idf_ = np.where(self.doc_freq > 0, idf, 0).astype(np.float32)
+        return self
+
+    def fit(self, documents):
+        self.doc_freq[:] = 0
+        self.n_docs = 0
+        return self.partial_fit(documents)
+
+    def transform(self, documents):
+        tfidf = self.hasher.transform(documents).tocsr()
+        tfidf.data *= self.idf_[tfidf.indices]
+        return normalize(tfidf, norm='l2', copy=False)
+
+    def fit_transform(self, documents):
+        return self.fit(documents).transform(documents)
@@ -0,0 +1,90 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+from chatbot_cli import FAQChatbot, load_faq_data
+
+
+QUERIES = [
+    "What is your return policy?",
+    "How long does shipping take?",
+    "Can I send items back?",
+    "Where is my package?",
+    "Do you ship to other countries?",
+    "How do I pay?",
+    "I forgot my password",
+    "Is there a discount for students?",
+    "What's the weather like?",
+    "My product arrived broken",
+]
+
+
+def expand_faq_data(faq_data, multiplier, seed=0):
+    """Adds synthetic FAQ entries so similarity matching dominates the cost."""
+    if multiplier <= 1:
+        return faq_data
+    rng = np.random.default_rng(seed)
+    vocabulary = sorted({w for faq in faq_data for w in faq['question'].lower().split()})
+    expanded = list(faq_data)
+    for i in range(len(faq_data) * (multiplier - 1)):
+        words = rng.choice(vocabulary, size=6)
+        expanded.append({'question': ' '.join(words) + f" item{i}", 'answer': f"Synthetic answer {i}"})
+    return expanded
+
+
+def run_threads(work, items, num_threads):
+    chunks = [items[i::num_threads] for i in range(num_threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        list(pool.map(work, chunks))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load test for FAQChatbot')
+    parser.add_argument('--threads', type=str, default='1,2,4,8',
+                       help='Comma-separated thread counts to test')
+    parser.add_argument('--requests', type=int, default=2000,
+                       help='Queries per thread-count run')
+    parser.add_argument('--faq-multiplier', type=int, default=200,
+                       help='Grow the FAQ set by this factor with synthetic entries')
+
+    args = parser.parse_args()
+
+    faq_data = expand_faq_data(load_faq_data(), args.faq_multiplier)
+    chatbot = FAQChatbot(faq_data)
+    print(f"FAQ entries: {len(faq_data)}, vocabulary: {len(chatbot.vectorizer.vocabulary_)}\n")
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.requests)]
+    expected = {q: chatbot.get_response(q) for q in QUERIES}
+
+    def answer_all(chunk):
+        for q in chunk:
+            assert chatbot.get_response(q) == expected[q]
+
+    # Matching stage alone: sparse products and argmax run in NumPy/SciPy,
+    # which release the GIL, so this part can use several cores.
+    query_vectors = [chatbot.vectorizer.transform([chatbot.preprocess_text(q)]) for q in queries]
+
+    def match_all(chunk):
+        for vector in chunk:
+            similarities = cosine_similarity(vector, chatbot.question_vectors)
+            np.argmax(similarities[0])
+
+    print(f"{'Threads':>7s} {'get_response q/s':>17s} {'speedup':>8s} {'matching q/s':>13s} {'speedup':>8s}")
+    print("-" * 58)
+    base_full = base_match = None
+    for num_threads in [int(t) for t in args.threads.split(',')]:
+        full_qps = len(queries) / run_threads(answer_all, queries, num_threads)
+        match_qps = len(query_vectors) / run_threads(match_all, query_vectors, num_threads)
+        base_full = base_full or full_qps
+        base_match = base_match or match_qps
+        print(f"{num_threads:7d} {full_qps:17.1f} {full_qps / base_full:7.2f}x "
+              f"{match_qps:13.1f} {match_qps / base_match:7.2f}x")
+
+    print("\nAll concurrent responses matched the single-threaded results.")
+
+
+if __name__ == '__main__':
+    main()
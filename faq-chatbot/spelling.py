@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+
+def _deletes(word, max_distance):
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w)) if len(w) > 1}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class SpellCorrector:
+    """Typo correction against a fixed vocabulary (SymSpell-style).
+
+    Every vocabulary word is indexed under all strings reachable by deleting
+    up to `max_distance` characters. A query token only generates its own
+    deletes and looks them up, so candidates come from a few dict lookups
+    instead of comparing against the whole vocabulary; only those candidates
+    get an exact edit-distance check.
+    """
+
+    def __init__(self, words=(), max_distance=2, min_length=3, min_count=3):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.min_count = min_count
+        self.counts = Counter()
+        self.index = {}
+        self.add_words(words)
+
+    def add_words(self, words):
+        for word in words:
+            if word not in self.counts:
+                for variant in _deletes(word, self.max_distance):
+                    self.index.setdefault(variant, []).append(word)
+            self.counts[word] += 1
+
+    def correct(self, token):
+        if token in self.counts or len(token) < self.min_length:
+            return token
+
+        # Short tokens get a tighter bound, otherwise almost anything matches
+        max_distance = 1 if len(token) <= 4 else self.max_distance
+        candidates = set()
+        for variant in _deletes(token, max_distance):
+            candidates.update(self.index.get(variant, ()))
+
+        matches = []
+        for word in candidates:
+            distance = edit_distance(token, word, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -self.counts[word], word))
+        if not matches:
+            return token
+
+        distance, _, word = min(matches)
+        # Correctly spelled words missing from the vocabulary are often two
+        # edits from some known word ("parcel" -> "cancel"), so a distance-2
+        # match is only trusted if it is the sole candidate and a common word.
+        if distance > 1 and (len(matches) > 1 or self.counts[word] < self.min_count):
+            return token
+        return word
+
+    def save(self, path, fingerprint=None):
+        with open(path, 'w') as f:
+            json.dump({
+                'fingerprint': fingerprint,
+                'max_distance': self.max_distance,
+                'min_length': self.min_length,
+                'min_count': self.min_count,
+                'counts': self.counts,
+                'index': self.index,
+            }, f)
+
+    @classmethod
+    def load(cls, path, fingerprint=None):
+        """Loads a saved index; returns None if it was built for other data."""
+        with open(path) as f:
+            data = json.load(f)
+        if fingerprint is not None and data.get('fingerprint') != fingerprint:
+            return None
+        corrector = cls(max_distance=data['max_distance'], min_length=data['min_length'],
+                        min_count=data.get('min_count', 3))
+        corrector.counts = Counter(data['counts'])
+        corrector.index = data['index']
+        return corrector
+
+
+def load_or_build(texts, tokenize, path=None):
+    """Returns a SpellCorrector over the tokens of `texts`.
+
+    With `path`, the index is loaded from there when it was built from the
+    same texts, and otherwise built once and saved there.
+    """
+    fingerprint = hashlib.sha1('\n'.join(texts).encode()).hexdigest()
+    if path and os.path.exists(path):
+        corrector = SpellCorrector.load(path, fingerprint)
+        if corrector is not None:
+            return corrector
+
+    corrector = SpellCorrector(token for text in texts for token in tokenize(text))
+    if path:
+        corrector.save(path, fingerprint)
+    return corrector
@@ -1,59 +1,23 @@
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import re
+import chatbot_cli
+from hashing_tfidf import HashingTfidfVectorizer
+from spelling import SpellCorrector
 
-def download_nltk_data():
-    """Download required NLTK datasets."""
-    required_data = ['punkt', 'stopwords', 'wordnet']
-    for data in required_data:
-        try:
-            nltk.data.find(f'tokenizers/{data}' if data == 'punkt' else f'corpora/{data}')
-        except LookupError:
-            nltk.download(data, quiet=True)
 
-download_nltk_data()
+class FAQChatbot(chatbot_cli.FAQChatbot):
+    """The shipped matcher, also reporting FAQ categories for scoring."""
 
-
-class FAQChatbot:
-    
-    def __init__(self, faq_data, similarity_threshold=0.3):
-        self.faq_data = faq_data
-        self.similarity_threshold = similarity_threshold
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-        
-        self.questions = [faq['question'] for faq in faq_data]
-        self.answers = [faq['answer'] for faq in faq_data]
+    def __init__(self, faq_data, *args, **kwargs):
         self.categories = [faq.get('category', 'general') for faq in faq_data]
-        
-        self.preprocessed_questions = [self.preprocess_text(q) for q in self.questions]
-        
-        self.vectorizer = TfidfVectorizer()
-        self.question_vectors = self.vectorizer.fit_transform(self.preprocessed_questions)
-        
-    def preprocess_text(self, text):
-        text = text.lower()
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        tokens = word_tokenize(text)
-        processed_tokens = [
-            self.lemmatizer.lemmatize(token)
-            for token in tokens
-            if token not in self.stop_words and len(token) > 2
-        ]
-        return ' '.join(processed_tokens)
+        super().__init__(faq_data, *args, **kwargs)
+    
+    def add_faqs(self, faqs):
+        faqs = list(faqs)
+        self.categories = self.categories + [faq.get('category', 'general') for faq in faqs]
+        super().add_faqs(faqs)
     
     def find_best_match(self, user_question):
-        processed_question = self.preprocess_text(user_question)
-        user_vector = self.vectorizer.transform([processed_question])
-        similarities = cosine_similarity(user_vector, self.question_vectors)
-        
-        best_match_idx = np.argmax(similarities[0])
-        best_similarity = similarities[0][best_match_idx]
+        best_match_idx, best_similarity = self.best_match(user_question)
         
         if best_similarity >= self.similarity_threshold:
             return (
@@ -298,6 +262,107 @@ def test_similarity_threshold():
         print()
 
 
+def test_concurrent_get_response():
+    from concurrent.futures import ThreadPoolExecutor
+    
+    chatbot = FAQChatbot(load_faq_data())
+    questions = [
+        "What is your return policy?",
+        "Where is my package?",
+        "discount",
+        "Tell me a joke",
+    ]
+    expected = {q: chatbot.get_response(q) for q in questions}
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(chatbot.get_response, questions * 50))
+    
+    for question, response in zip(questions * 50, responses):
+        assert response == expected[question]
+
+
+def test_hashing_engine():
+    faq_data = load_faq_data()
+    tfidf_bot = FAQChatbot(faq_data, engine='tfidf')
+    hashing_bot = FAQChatbot(faq_data, engine='hashing')
+    
+    for question in ["How do I return a product?", "Where is my package?", "warranty", "Tell me a joke"]:
+        expected = tfidf_bot.get_response(question)
+        response = hashing_bot.get_response(question)
+        assert response['matched_question'] == expected['matched_question']
+        assert abs(response['confidence'] - expected['confidence']) < 0.01
+
+
+def test_hashing_partial_fit():
+    documents = FAQChatbot(load_faq_data()).preprocessed_questions
+    full = HashingTfidfVectorizer(n_features=2 ** 12).fit(documents)
+    incremental = HashingTfidfVectorizer(n_features=2 ** 12)
+    incremental.partial_fit(documents[:4]).partial_fit(documents[4:])
+    
+    assert incremental.n_docs == full.n_docs
+    assert np.allclose(incremental.idf_, full.idf_)
+
+
+def test_add_faqs():
+    faq_data = load_faq_data()
+    new_faqs = [
+        {"question": "Do you sell gift cards?", "answer": "Yes, in any amount.", "category": "gifts"},
+        {"question": "Can I pick up my order in store?", "answer": "Yes, at any branch.", "category": "orders"},
+    ]
+    
+    for engine in ['hashing', 'tfidf']:
+        chatbot = FAQChatbot(faq_data, engine=engine)
+        assert chatbot.get_response("gift cards")['answer'] is None
+        
+        chatbot.add_faqs(new_faqs)
+        rebuilt = FAQChatbot(faq_data + new_faqs, engine=engine)
+        
+        assert chatbot.get_response("gift cards")['category'] == "gifts"
+        assert chatbot.question_vectors.shape[0] == len(faq_data) + len(new_faqs)
+        for question in ["gift cards", "pick up in store", "What is your return policy?", "warranty"]:
+            response = chatbot.get_response(question)
+            expected = rebuilt.get_response(question)
+            assert response['matched_question'] == expected['matched_question']
+            assert abs(response['confidence'] - expected['confidence']) < 0.01
+
+
+def test_spell_correction():
+    faq_data = load_faq_data()
+    plain_bot = FAQChatbot(faq_data)
+    spelling_bot = FAQChatbot(faq_data, spell_correction=True)
+    
+    typo_questions = [
+        ("retrun polcy", "returns"),
+        ("how long does shiping take", "shipping"),
+        ("reset my pasword", "account"),
+        ("studnet discounts", "discounts"),
+    ]
+    for question, expected_category in typo_questions:
+        assert spelling_bot.get_response(question)['category'] == expected_category
+    
+    assert plain_bot.get_response("retrun polcy")['answer'] is None
+    
+    # Valid words outside the FAQ vocabulary must not be "corrected" into a match
+    for question in ["where is my parcel", "What's the weather like?", "Tell me a joke"]:
+        assert spelling_bot.get_response(question)['answer'] is None
+    
+    # Queries that already match are answered as typed
+    for question in ["What is your return policy?", "How do I return a product?", "warranty"]:
+        assert spelling_bot.get_response(question) == plain_bot.get_response(question)
+
+
+def test_spell_index_persistence(tmp_path):
+    faq_data = load_faq_data()
+    index_path = str(tmp_path / "spelling_index.json")
+    
+    FAQChatbot(faq_data, spell_correction=True, spell_index=index_path)
+    loaded = SpellCorrector.load(index_path)
+    
+    assert loaded.correct("warrenty") == "warranty"
+    assert loaded.correct("order") == "order"
+    assert loaded.correct("parcel") == "parcel"
+
+
 if __name__ == "__main__":
     test_preprocessing()
     print("\n\n")
@@ -0,0 +1,28 @@
+import numpy as np
+from chatbot_cli import FAQChatbot, load_faq_data
+from evaluate import score_queries, threshold_sweep
+
+
+def test_top1_matches_best_match_on_ties():
+    chatbot = FAQChatbot(load_faq_data())
+    # Each of the first three queries scores two FAQ questions equally
+    queries = ["support student", "cancel warranty", "contact discount", "shipping",
+               "What is your return policy?", "Tell me a joke", "support student"]
+    top_idx, top_sim = score_queries(chatbot, queries, top_k=3)
+
+    assert np.allclose(top_sim[:3, 0], top_sim[:3, 1])
+    assert top_idx[:, 0].tolist() == [int(chatbot.best_match(q)[0]) for q in queries]
+    assert np.all(np.diff(top_sim, axis=1) <= 0)
+
+
+def test_threshold_sweep():
+    top_idx = np.array([[0, 1], [1, 0], [2, 0], [0, 1]])
+    top_sim = np.array([[0.9, 0.1], [0.4, 0.2], [0.2, 0.1], [0.5, 0.3]])
+    # Correct top-1, correct top-1, out of scope, wrong top-1
+    labels = np.array([0, 1, -1, 2])
+
+    rows = threshold_sweep(top_idx, top_sim, labels, np.array([0.0, 0.3, 0.6]))
+
+    assert [r['accuracy'] for r in rows] == [0.5, 0.75, 0.5]
+    assert [r['in_scope_accuracy'] for r in rows] == [2 / 3, 2 / 3, 1 / 3]
+    assert [r['out_of_scope_accuracy'] for r in rows] == [0.0, 1.0, 1.0]
@@ -0,0 +1,173 @@
+import abc
+import ast
+import os
+import cv2
+import numpy as np
+
+
+def letterbox(image, new_shape=640, color=(114, 114, 114)):
+    """Resizes keeping aspect ratio and pads to `new_shape`.
+
+    Returns the padded image, the scale ratio and the (left, top) padding,
+    which `scale_boxes` needs to map boxes back to the original image.
+    """
+    if isinstance(new_shape, int):
+        new_shape = (new_shape, new_shape)
+
+    h, w = image.shape[:2]
+    ratio = min(new_shape[0] / h, new_shape[1] / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_w = (new_shape[1] - new_w) / 2
+    pad_h = (new_shape[0] - new_h) / 2
+
+    if (w, h) != (new_w, new_h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right,
+                               cv2.BORDER_CONSTANT, value=color)
+    return image, ratio, (left, top)
+
+
+def scale_boxes(boxes, ratio, pad, image_shape):
+    boxes = boxes.copy()
+    boxes[:, [0, 2]] -= pad[0]
+    boxes[:, [1, 3]] -= pad[1]
+    boxes /= ratio
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, image_shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, image_shape[0])
+    return boxes
+
+
+def postprocess(output, conf_threshold, iou_threshold=0.7, max_det=300):
+    """Decodes a raw YOLOv8 head output of shape (1, 4 + classes, anchors).
+
+    The NMS defaults match ultralytics `predict` (iou=0.7, max_det=300), so
+    exported graphs return the same boxes as the PyTorch path.
+    """
+    preds = output[0].T
+    class_scores = preds[:, 4:]
+    class_ids = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(preds)), class_ids]
+
+    keep = scores >= conf_threshold
+    preds, scores, class_ids = preds[keep], scores[keep], class_ids[keep]
+    if len(preds) == 0:
+        return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+
+    cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+    xywh = np.stack([boxes[:, 0], boxes[:, 1], w, h], axis=1).tolist()
+    indices = cv2.dnn.NMSBoxesBatched(xywh, scores.tolist(), class_ids.tolist(),
+                                      conf_threshold, iou_threshold)
+    # NMS returns indices ordered by descending score
+    indices = np.array(indices, dtype=np.int64).reshape(-1)[:max_det]
+    return boxes[indices], scores[indices], class_ids[indices]
+
+
+def _parse_names(raw):
+    if isinstance(raw, dict):
+        return {int(k): v for k, v in raw.items()}
+    if isinstance(raw, str):
+        return {int(k): v for k, v in ast.literal_eval(raw).items()}
+    return {}
+
+
+class ExportedBackend(abc.ABC):
+    """Shared pre/post-processing for exported YOLOv8 graphs."""
+
+    def __init__(self, imgsz=640):
+        self.imgsz = imgsz
+        self.class_names = {}
+
+    def __call__(self, frame, conf_threshold, iou_threshold=0.7, max_det=300):
+        image, ratio, pad = letterbox(frame, self.imgsz)
+        blob = cv2.dnn.blobFromImage(image, 1 / 255.0, swapRB=True)
+        output = self.infer(blob)
+        boxes, scores, class_ids = postprocess(output, conf_threshold, iou_threshold, max_det)
+        boxes = scale_boxes(boxes, ratio, pad, frame.shape)
+        return boxes, scores, class_ids
+
+    def _set_static_shape(self, height, width):
+        # Graphs exported without dynamic axes only accept their export size
+        requested = (self.imgsz, self.imgsz) if isinstance(self.imgsz, int) else tuple(self.imgsz)
+        if requested != (height, width):
+            print(f"Warning: model was exported for {width}x{height} input; "
+                  f"ignoring imgsz {requested[1]}x{requested[0]}")
+        self.imgsz = (height, width)
+
+    @abc.abstractmethod
+    def infer(self, blob):
+        """Runs the graph on a preprocessed NCHW blob and returns the raw head output."""
+
+
+class OnnxBackend(ExportedBackend):
+    def __init__(self, model_path, imgsz=640, num_threads=None):
+        super().__init__(imgsz)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Exported graphs have a fixed input size unless exported as dynamic
+        if isinstance(model_input.shape[2], int):
+            self._set_static_shape(model_input.shape[2], model_input.shape[3])
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.class_names = _parse_names(metadata.get('names'))
+
+    def infer(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVINOBackend(ExportedBackend):
+    def __init__(self, model_path, imgsz=640, num_threads=None):
+        super().__init__(imgsz)
+        import openvino as ov
+
+        if os.path.isdir(model_path):
+            model_dir = model_path
+            model_path = next(os.path.join(model_dir, f) for f in os.listdir(model_dir)
+                              if f.endswith('.xml'))
+        else:
+            model_dir = os.path.dirname(model_path)
+
+        core = ov.Core()
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if num_threads:
+            config['INFERENCE_NUM_THREADS'] = num_threads
+        model = core.read_model(model_path)
+        self.compiled = core.compile_model(model, 'CPU', config)
+        self.output = self.compiled.output(0)
+
+        input_shape = model.input(0).get_partial_shape()
+        if input_shape.is_static:
+            self._set_static_shape(input_shape[2].get_length(), input_shape[3].get_length())
+
+        metadata_path = os.path.join(model_dir, 'metadata.yaml')
+        if os.path.exists(metadata_path):
+            import yaml
+            with open(metadata_path) as f:
+                self.class_names = _parse_names(yaml.safe_load(f).get('names'))
+
+    def infer(self, blob):
+        return self.compiled([blob])[self.output]
+
+
+def is_exported_model(model_path):
+    return (model_path.endswith('.onnx') or model_path.endswith('.xml')
+            or model_path.rstrip('/\\').endswith('_openvino_model'))
+
+
+def load_exported_backend(model_path, imgsz=640, num_threads=None):
+    if model_path.endswith('.onnx'):
+        return OnnxBackend(model_path, imgsz, num_threads)
+    return OpenVINOBackend(model_path, imgsz, num_threads)
@@ -0,0 +1,93 @@
+import argparse
+import time
+import cv2
+import numpy as np
+from utils import draw_tracks
+
+
+def draw_tracks_legacy(frame, tracked_objects, show_confidence=False):
+    # Previous implementation, kept here as the benchmark baseline
+    for obj in tracked_objects:
+        x1, y1, x2, y2 = obj['bbox']
+        track_id = obj['track_id']
+        np.random.seed(int(track_id))
+        color = tuple(map(int, np.random.randint(50, 255, 3)))
+
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+        if show_confidence:
+            label = f"ID:{track_id} {obj['class']} {obj['confidence']:.2f}"
+        else:
+            label = f"ID:{track_id} {obj['class']}"
+        text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+        cv2.rectangle(frame, (x1, y1 - text_size[1] - 10),
+                     (x1 + text_size[0], y1), color, -1)
+        cv2.putText(frame, label, (x1, y1 - 5),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    return frame
+
+
+def make_objects(num_boxes, width, height, frame_idx, rng_seed=0):
+    rng = np.random.default_rng(rng_seed)
+    starts = rng.integers(0, [width - 80, height - 80], (num_boxes, 2))
+    sizes = rng.integers(20, 80, (num_boxes, 2))
+    velocity = rng.integers(-3, 4, (num_boxes, 2))
+    confidences = rng.uniform(0.3, 1.0, num_boxes)
+    classes = ['person', 'car', 'bicycle', 'dog']
+
+    objects = []
+    for i in range(num_boxes):
+        x, y = (starts[i] + velocity[i] * frame_idx) % [width - 80, height - 80]
+        w, h = sizes[i]
+        objects.append({
+            'track_id': str(i + 1),
+            'bbox': [int(x), int(y), int(x + w), int(y + h)],
+            'class': classes[i % len(classes)],
+            'confidence': float(confidences[i]),
+        })
+    return objects
+
+
+def time_renderer(render, frames_objects, base_frame, repeats):
+    timings = []
+    for _ in range(repeats):
+        for objects in frames_objects:
+            frame = base_frame.copy()
+            start = time.perf_counter()
+            render(frame, objects)
+            timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark for track overlay rendering')
+    parser.add_argument('--boxes', type=int, default=250, help='Boxes per frame')
+    parser.add_argument('--frames', type=int, default=50, help='Distinct frames to render')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the frames')
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--show-conf', action='store_true', help='Include confidence in labels')
+
+    args = parser.parse_args()
+
+    base_frame = np.full((args.height, args.width, 3), 40, dtype=np.uint8)
+    frames_objects = [make_objects(args.boxes, args.width, args.height, i)
+                      for i in range(args.frames)]
+
+    renderers = {
+        'legacy': lambda f, o: draw_tracks_legacy(f, o, args.show_conf),
+        'draw_tracks': lambda f, o: draw_tracks(f, o, args.show_conf),
+        'draw_tracks (overlay 0.6)': lambda f, o: draw_tracks(f, o, args.show_conf, overlay_alpha=0.6),
+    }
+
+    print(f"{args.boxes} boxes/frame at {args.width}x{args.height}, "
+          f"{args.frames * args.repeats} frames per renderer\n")
+    print(f"{'Renderer':28s} {'mean ms':>9s} {'p95 ms':>9s} {'us/box':>8s}")
+    print("-" * 58)
+    for name, render in renderers.items():
+        timings = time_renderer(render, frames_objects, base_frame, args.repeats)
+        print(f"{name:28s} {timings.mean():9.3f} {np.percentile(timings, 95):9.3f} "
+              f"{timings.mean() * 1000 / args.boxes:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
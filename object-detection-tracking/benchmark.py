@@ -0,0 +1,312 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import time
+import cv2
+import numpy as np
+from profiler import StageProfiler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    # Peak of the whole process lifetime, which is why every run gets its own process
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if platform.system() == 'Darwin' else 1024), 1)
+
+
+def generate_scene(num_objects, width, height, num_frames, seed=0):
+    """Deterministic synthetic clip of shapes bouncing over a textured background.
+
+    Yields (frame, ground_truth) pairs, where ground_truth is a list of
+    (object_id, [x1, y1, x2, y2]) boxes. Frames are drawn on demand, so
+    memory does not grow with the clip length.
+    """
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 5)
+
+    sizes = rng.integers(min(width, height) // 20, min(width, height) // 8, (num_objects, 2))
+    positions = rng.uniform([0, 0], [width, height], (num_objects, 2)) % (np.array([width, height]) - sizes)
+    velocities = rng.uniform(-6, 6, (num_objects, 2))
+    colors = rng.integers(30, 255, (num_objects, 3))
+    circles = rng.random(num_objects) < 0.5
+
+    for _ in range(num_frames):
+        frame = background.copy()
+        boxes = []
+        for i in range(num_objects):
+            x, y = positions[i].astype(int)
+            w, h = sizes[i]
+            color = tuple(int(c) for c in colors[i])
+            if circles[i]:
+                cv2.ellipse(frame, (x + w // 2, y + h // 2), (w // 2, h // 2), 0, 0, 360, color, -1)
+            else:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), color, -1)
+            boxes.append((i, [int(x), int(y), int(x + w), int(y + h)]))
+        yield frame, boxes
+
+        positions += velocities
+        for axis, limit in ((0, width), (1, height)):
+            out = (positions[:, axis] < 0) | (positions[:, axis] > limit - sizes[:, axis])
+            velocities[out, axis] *= -1
+            positions[:, axis] = positions[:, axis].clip(0, limit - sizes[:, axis])
+
+
+def replay_frames(source, num_frames):
+    """Yields (frame, None) from a video, looping short clips to `num_frames`."""
+    cap = cv2.VideoCapture(source)
+    produced = 0
+    looped = False
+    try:
+        while produced < num_frames:
+            ret, frame = cap.read()
+            if not ret:
+                if produced == 0 or looped:
+                    raise RuntimeError(f"Cannot read frames from {source}")
+                cap.release()
+                cap = cv2.VideoCapture(source)
+                looped = True
+                continue
+            looped = False
+            yield frame, None
+            produced += 1
+    finally:
+        cap.release()
+
+
+def canned_detections(ground_truth, rng, jitter=2.0, miss_rate=0.02):
+    """One frame of detector-like output derived from the ground-truth boxes."""
+    detections = []
+    for _, bbox in ground_truth:
+        if rng.random() < miss_rate:
+            continue
+        x1, y1, x2, y2 = (np.array(bbox) + rng.normal(0, jitter, 4)).astype(int)
+        detections.append({'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                           'confidence': 0.9, 'class': 'object', 'class_id': 0})
+    return detections
+
+
+def iou_matrix(a, b):
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+class IDSwitchCounter:
+    """Counts ground-truth objects whose matched track ID changes (IoU >= 0.5)."""
+
+    def __init__(self, iou_threshold=0.5):
+        self.iou_threshold = iou_threshold
+        self.last_track = {}
+        self.switches = 0
+        self.matches = 0
+
+    def update(self, ground_truth, tracked_objects):
+        if not ground_truth or not tracked_objects:
+            return
+        ious = iou_matrix([b for _, b in ground_truth], [o['bbox'] for o in tracked_objects])
+        # Greedy one-to-one matching, best overlaps first
+        for flat in np.argsort(-ious, axis=None):
+            gi, ti = np.unravel_index(flat, ious.shape)
+            if np.isnan(ious[gi, ti]):
+                continue
+            if ious[gi, ti] < self.iou_threshold:
+                break
+            gt_id = ground_truth[gi][0]
+            track_id = tracked_objects[ti]['track_id']
+            if gt_id in self.last_track and self.last_track[gt_id] != track_id:
+                self.switches += 1
+            self.last_track[gt_id] = track_id
+            self.matches += 1
+            ious[gi, :] = np.nan
+            ious[:, ti] = np.nan
+
+
+def run_pipeline(frames, tracker, num_frames, detector=None, seed=0):
+    """Runs detection + tracking over `frames` ((frame, ground_truth) pairs).
+
+    Without a detector, detections are canned from the ground truth. ID
+    switches are counted whenever ground truth is available.
+    """
+    profiler = StageProfiler(window=num_frames)
+    id_switches = IDSwitchCounter()
+    rng = np.random.default_rng(seed)
+    class_names = detector.class_names if detector is not None else {0: 'object'}
+    has_ground_truth = False
+
+    count = 0
+    start = time.perf_counter()
+    for frame, ground_truth in frames:
+        if detector is None:
+            dets = canned_detections(ground_truth, rng)
+        else:
+            with profiler.stage('detect'):
+                dets = detector.detect(frame)
+        with profiler.stage('update_tracks'):
+            tracks = tracker.update_tracks(dets, frame)
+        with profiler.stage('get_tracked_objects'):
+            tracked_objects = tracker.get_tracked_objects(tracks, class_names, dets)
+        profiler.end_frame()
+
+        if ground_truth is not None:
+            has_ground_truth = True
+            id_switches.update(ground_truth, tracked_objects)
+        count += 1
+    elapsed = time.perf_counter() - start
+
+    summary = profiler.summary()
+    result = {
+        'frames': count,
+        'throughput_fps': round(count / elapsed, 2),
+        'stages': summary['stages'],
+        'total': summary['total'],
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if has_ground_truth:
+        result['id_switches'] = id_switches.switches
+        result['matched_boxes'] = id_switches.matches
+    return result
+
+
+def open_frames(job):
+    if job['source']:
+        return replay_frames(job['source'], job['frames'])
+    return generate_scene(job['objects'], job['width'], job['height'], job['frames'], job['seed'])
+
+
+def run_job(job):
+    """Runs one benchmark; main() calls this in a fresh process per run."""
+    from tracker import ObjectTracker
+
+    detector = None
+    if job['model']:
+        try:
+            from detector import ObjectDetector
+            detector = ObjectDetector(model_path=job['model'], conf_threshold=job['conf'],
+                                      num_threads=job['threads'])
+        except (ImportError, FileNotFoundError) as e:
+            return {'skipped': str(e)}
+    return run_pipeline(open_frames(job), ObjectTracker(), job['frames'], detector=detector,
+                        seed=job['seed'])
+
+
+def run_isolated(job):
+    # A fresh process per run keeps peak RSS from including earlier runs
+    ctx = mp.get_context('spawn')
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_job, (job,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reproducible detection/tracking benchmark on synthetic video')
+    parser.add_argument('--mode', type=str, default='all', choices=['all', 'tracker', 'full'],
+                       help='"tracker" replays canned detections, "full" runs ObjectDetector + ObjectTracker')
+    parser.add_argument('--models', type=str, default='yolov8n.pt',
+                       help='Comma-separated model paths for full mode (e.g. "yolov8n.pt,yolov8n.onnx")')
+    parser.add_argument('--objects', type=int, default=10, help='Number of synthetic objects')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--source', type=str, default=None,
+                       help='Replay frames from this video instead of generating shapes (no ID-switch metric)')
+    parser.add_argument('--conf', type=float, default=0.5)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--save-video', type=str, default=None,
+                       help='Also write the generated clip to this path')
+    parser.add_argument('--results', type=str, default='output/benchmark_results.json',
+                       help='JSON file the run is appended to')
+
+    args = parser.parse_args()
+
+    job = {
+        'source': args.source,
+        'objects': args.objects,
+        'width': args.width,
+        'height': args.height,
+        'frames': args.frames,
+        'seed': args.seed,
+        'conf': args.conf,
+        'threads': args.threads,
+        'model': None,
+    }
+
+    if args.source:
+        cap = cv2.VideoCapture(args.source)
+        resolution = [int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))]
+        cap.release()
+    else:
+        resolution = [args.width, args.height]
+        if args.save_video:
+            writer = cv2.VideoWriter(args.save_video, cv2.VideoWriter_fourcc(*'mp4v'),
+                                     30, (args.width, args.height))
+            for frame, _ in open_frames(job):
+                writer.write(frame)
+            writer.release()
+
+    runs = {}
+    if args.mode in ('all', 'tracker'):
+        if args.source:
+            print("Skipping tracker mode: canned detections need a synthetic scene")
+        else:
+            print("Running tracker on canned detections...")
+            runs['tracker'] = run_isolated(job)
+
+    if args.mode in ('all', 'full'):
+        for model_path in args.models.split(','):
+            model_path = model_path.strip()
+            print(f"Running full pipeline with {model_path}...")
+            result = run_isolated({**job, 'model': model_path})
+            if 'skipped' in result:
+                print(f"Skipping {model_path}: {result['skipped']}")
+                continue
+            runs[f'full:{os.path.basename(model_path)}'] = result
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'source': args.source or 'synthetic',
+            'objects': None if args.source else args.objects,
+            'resolution': resolution,
+            'frames': args.frames,
+            'seed': args.seed,
+            'threads': args.threads,
+        },
+        'runs': runs,
+    }
+
+    print(f"\n{'Run':30s} {'FPS':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'ID sw':>6s} {'RSS MB':>8s}")
+    print("-" * 75)
+    for name, run in runs.items():
+        total = run['total']
+        print(f"{name:30s} {run['throughput_fps']:8.1f} {total['p50_ms']:9.2f} {total['p95_ms']:9.2f} "
+              f"{str(run.get('id_switches', '-')):>6s} {str(run['peak_rss_mb']):>8s}")
+
+    history = []
+    if os.path.exists(args.results):
+        with open(args.results) as f:
+            history = json.load(f)
+    history.append(record)
+    os.makedirs(os.path.dirname(args.results) or '.', exist_ok=True)
+    with open(args.results, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"\nResults appended to {args.results}")
+
+
+if __name__ == '__main__':
+    main()
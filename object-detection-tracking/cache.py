@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+
+DETECTION_DTYPE = np.dtype([
+    ('x1', np.int32),
+    ('y1', np.int32),
+    ('x2', np.int32),
+    ('y2', np.int32),
+    ('confidence', np.float64),
+    ('class_id', np.int32),
+])
+
+
+def hash_video(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DetectionCache:
+    """Per-video cache of raw detector output.
+
+    Entries are keyed by the video contents, the model path, the confidence
+    threshold and the inference size / ROI settings, so anything applied after detection (class
+    filtering, tracker settings, drawing) can be replayed without running
+    the model again. Detections of all frames are stored in one flat
+    `.npy` file with a per-frame offsets array and are memory-mapped on load.
+    """
+
+    def __init__(self, cache_dir, video_path, model_path, conf_threshold, imgsz=640, roi=None):
+        os.makedirs(cache_dir, exist_ok=True)
+        key_source = f"{hash_video(video_path)}|{model_path}|{conf_threshold:.4f}|{imgsz}|{roi or ''}"
+        self.key = hashlib.sha1(key_source.encode()).hexdigest()[:20]
+        base = os.path.join(cache_dir, self.key)
+        self.rows_path = base + '.dets.npy'
+        self.offsets_path = base + '.offsets.npy'
+        self.meta_path = base + '.json'
+
+        self.class_names = None
+        self._rows = None
+        self._offsets = None
+        self._pending = []
+        self._pending_offsets = [0]
+
+    def exists(self):
+        return all(os.path.exists(p) for p in (self.rows_path, self.offsets_path, self.meta_path))
+
+    def load(self):
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        self.class_names = {int(k): v for k, v in meta['class_names'].items()}
+        self._rows = np.load(self.rows_path, mmap_mode='r')
+        self._offsets = np.load(self.offsets_path, mmap_mode='r')
+
+    def __len__(self):
+        return 0 if self._offsets is None else len(self._offsets) - 1
+
+    def get(self, frame_idx):
+        if frame_idx >= len(self):
+            return []
+        start, end = self._offsets[frame_idx], self._offsets[frame_idx + 1]
+        detections = []
+        for row in self._rows[start:end]:
+            cls = int(row['class_id'])
+            detections.append({
+                'bbox': [int(row['x1']), int(row['y1']), int(row['x2']), int(row['y2'])],
+                'confidence': float(row['confidence']),
+                'class': self.class_names.get(cls, str(cls)),
+                'class_id': cls
+            })
+        return detections
+
+    def add(self, detections):
+        for det in detections:
+            x1, y1, x2, y2 = det['bbox']
+            self._pending.append((x1, y1, x2, y2, det['confidence'], det['class_id']))
+        self._pending_offsets.append(len(self._pending))
+
+    def save(self, class_names):
+        rows = np.array(self._pending, dtype=DETECTION_DTYPE)
+        offsets = np.array(self._pending_offsets, dtype=np.int64)
+
+        # Write under temporary names first so an interrupted save never
+        # leaves a partial entry that exists() would accept.
+        for path, array in ((self.rows_path, rows), (self.offsets_path, offsets)):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        with open(self.meta_path + '.tmp', 'w') as f:
+            json.dump({'class_names': {str(k): v for k, v in class_names.items()},
+                       'frames': len(offsets) - 1}, f)
+        os.replace(self.meta_path + '.tmp', self.meta_path)
+
+        self._pending = []
+        self._pending_offsets = [0]
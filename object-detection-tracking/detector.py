@@ -1,23 +1,112 @@
 from ultralytics import YOLO
 import cv2
 import numpy as np
+from backends import is_exported_model, load_exported_backend
+
+
+def parse_roi(spec):
+    """Parses "x1,y1,x2,y2" crops and "x1,y1,x2,y2,x3,y3,..." polygons.
+
+    Several regions can be given separated by ';'. Returns a list of
+    polygons as (N, 2) int32 arrays.
+    """
+    polygons = []
+    for part in spec.split(';'):
+        values = [int(float(v)) for v in part.split(',') if v.strip()]
+        if len(values) == 4:
+            x1, y1, x2, y2 = values
+            values = [x1, y1, x2, y1, x2, y2, x1, y2]
+        if len(values) < 6 or len(values) % 2:
+            raise ValueError(f"Invalid ROI '{part}': expected 4 values or at least 3 x,y points")
+        polygons.append(np.array(values, dtype=np.int32).reshape(-1, 2))
+    return polygons
+
+
+def roi_crop(roi, shape):
+    """Bounding rectangle (x1, y1, x2, y2) of the ROI polygons, clipped to a frame of `shape`."""
+    h, w = shape[:2]
+    points = np.concatenate(roi)
+    x1, y1 = np.clip(points.min(axis=0), 0, [w, h])
+    x2, y2 = np.clip(points.max(axis=0) + 1, 0, [w, h])
+    if x2 <= x1 or y2 <= y1:
+        raise ValueError(f"ROI lies outside the {w}x{h} frame")
+    return int(x1), int(y1), int(x2), int(y2)
 
 
 class ObjectDetector:
-    def __init__(self, model_path='yolov8n.pt', conf_threshold=0.5):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path='yolov8n.pt', conf_threshold=0.5, num_threads=None,
+                 imgsz=640, roi=None, iou_threshold=0.7, max_det=300):
         self.conf_threshold = conf_threshold
-        self.class_names = self.model.names
+        self.iou_threshold = iou_threshold
+        self.max_det = max_det
+        self.imgsz = imgsz
+        self.roi = roi
+        self._roi_shape = None
+        
+        # Exported graphs (.onnx, OpenVINO .xml / *_openvino_model dir) run
+        # through their own CPU runtime; anything else goes through PyTorch.
+        if is_exported_model(model_path):
+            self.model = None
+            self.backend = load_exported_backend(model_path, imgsz=imgsz, num_threads=num_threads)
+            self.class_names = self.backend.class_names
+        else:
+            if num_threads:
+                import torch
+                torch.set_num_threads(num_threads)
+            self.model = YOLO(model_path)
+            self.backend = None
+            self.class_names = self.model.names
+
+    def _predict(self, frame):
+        if self.backend is not None:
+            return self.backend(frame, self.conf_threshold, self.iou_threshold, self.max_det)
+        
+        results = self.model(frame, conf=self.conf_threshold, iou=self.iou_threshold,
+                             max_det=self.max_det, imgsz=self.imgsz, verbose=False)[0]
+        boxes = results.boxes
+        return boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy()
+
+    def _prepare_roi(self, shape):
+        # The crop rectangle and polygon mask only depend on the frame size,
+        # so they are built once and reused for every frame.
+        x1, y1, x2, y2 = self._crop = roi_crop(self.roi, shape)
+
+        mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        cv2.fillPoly(mask, [p - [x1, y1] for p in self.roi], 255)
+        self._mask = mask
+        self._masked_out = None if mask.all() else mask == 0
+        self._roi_shape = shape
+
+    def _predict_roi(self, frame):
+        if frame.shape != self._roi_shape:
+            self._prepare_roi(frame.shape)
+        x1, y1, x2, y2 = self._crop
+
+        region = frame[y1:y2, x1:x2]
+        if self._masked_out is not None:
+            region = region.copy()
+            region[self._masked_out] = 114
+        
+        boxes, scores, class_ids = self._predict(region)
+        boxes = boxes + [x1, y1, x1, y1]
+        
+        # Keep only boxes whose centre falls inside one of the ROI polygons
+        cx = ((boxes[:, 0] + boxes[:, 2]) / 2 - x1).astype(int).clip(0, x2 - x1 - 1)
+        cy = ((boxes[:, 1] + boxes[:, 3]) / 2 - y1).astype(int).clip(0, y2 - y1 - 1)
+        inside = self._mask[cy, cx] > 0
+        return boxes[inside], scores[inside], class_ids[inside]
 
     def detect(self, frame):
-        results = self.model(frame, conf=self.conf_threshold, verbose=False)[0]
+        if self.roi:
+            boxes, scores, class_ids = self._predict_roi(frame)
+        else:
+            boxes, scores, class_ids = self._predict(frame)
         
         detections = []
-        for box in results.boxes:
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
-            class_name = self.class_names[cls]
+        for (x1, y1, x2, y2), conf, cls in zip(boxes, scores, class_ids):
+            conf = float(conf)
+            cls = int(cls)
+            class_name = self.class_names.get(cls, str(cls))
             
             detections.append({
                 'bbox': [int(x1), int(y1), int(x2), int(y2)],
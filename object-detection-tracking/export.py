@@ -0,0 +1,152 @@
+import json
+import numpy as np
+
+
+KIND_DETECTION = 0
+KIND_TRACK = 1
+
+RECORD_DTYPE = np.dtype([
+    ('kind', np.uint8),
+    ('frame', np.int32),
+    ('timestamp', np.float64),
+    ('track_id', np.int64),
+    ('x1', np.int32),
+    ('y1', np.int32),
+    ('x2', np.int32),
+    ('y2', np.int32),
+    ('class_id', np.int32),
+    ('confidence', np.float32),
+])
+
+
+def _track_id_to_int(track_id):
+    try:
+        return int(track_id)
+    except (TypeError, ValueError):
+        return -1
+
+
+class ResultExporter:
+    """Streams per-frame detections and confirmed tracks to disk.
+
+    Rows are buffered in memory and written in batches of `batch_frames`
+    frames. Paths ending in `.jsonl` are written as one JSON object per row,
+    anything else uses the columnar format: a sequence of `.npy` chunks of
+    RECORD_DTYPE appended to the same file.
+    """
+
+    def __init__(self, path, batch_frames=64, fmt=None):
+        self.path = path
+        self.batch_frames = batch_frames
+        self.fmt = fmt or ('jsonl' if path.endswith('.jsonl') else 'columnar')
+        if self.fmt not in ('jsonl', 'columnar'):
+            raise ValueError(f"Unknown export format: {self.fmt}")
+
+        self._file = open(path, 'w' if self.fmt == 'jsonl' else 'wb')
+        self._rows = []
+        self._pending_frames = 0
+
+    def add_frame(self, frame_idx, timestamp, detections, tracked_objects):
+        for det in detections:
+            x1, y1, x2, y2 = det['bbox']
+            self._rows.append((KIND_DETECTION, frame_idx, timestamp, -1,
+                               x1, y1, x2, y2, det['class_id'], det['confidence']))
+
+        for obj in tracked_objects:
+            x1, y1, x2, y2 = obj['bbox']
+            class_id = obj['class_id'] if obj['class_id'] is not None else -1
+            self._rows.append((KIND_TRACK, frame_idx, timestamp,
+                               _track_id_to_int(obj['track_id']),
+                               x1, y1, x2, y2, class_id, obj['confidence']))
+
+        self._pending_frames += 1
+        if self._pending_frames >= self.batch_frames:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            if self.fmt == 'jsonl':
+                self._write_jsonl(self._rows)
+            else:
+                np.save(self._file, np.array(self._rows, dtype=RECORD_DTYPE))
+        self._rows = []
+        self._pending_frames = 0
+
+    def _write_jsonl(self, rows):
+        lines = []
+        for kind, frame_idx, timestamp, track_id, x1, y1, x2, y2, class_id, conf in rows:
+            record = {
+                'type': 'track' if kind == KIND_TRACK else 'detection',
+                'frame': int(frame_idx),
+                'timestamp': round(float(timestamp), 4),
+                'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                'class_id': int(class_id),
+                'confidence': round(float(conf), 4),
+            }
+            if kind == KIND_TRACK:
+                record['track_id'] = int(track_id)
+            lines.append(json.dumps(record))
+        self._file.write('\n'.join(lines) + '\n')
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _read_columnar(path):
+    chunks = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                chunks.append(np.load(f, allow_pickle=False))
+            except (EOFError, ValueError):
+                break
+    if not chunks:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.concatenate(chunks)
+
+
+def _read_jsonl(path):
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            kind = KIND_TRACK if rec['type'] == 'track' else KIND_DETECTION
+            rows.append((kind, rec['frame'], rec['timestamp'], rec.get('track_id', -1),
+                         *rec['bbox'], rec['class_id'], rec['confidence']))
+    return np.array(rows, dtype=RECORD_DTYPE)
+
+
+def load_results(path):
+    """Loads an export back as two dicts of NumPy column arrays.
+
+    Returns `(detections, tracks)`, each mapping `frame`, `timestamp`,
+    `track_id`, `bbox` (N x 4), `class_id` and `confidence` to arrays.
+    """
+    if path.endswith('.jsonl'):
+        records = _read_jsonl(path)
+    else:
+        records = _read_columnar(path)
+
+    def columns(mask):
+        sub = records[mask]
+        return {
+            'frame': sub['frame'],
+            'timestamp': sub['timestamp'],
+            'track_id': sub['track_id'],
+            'bbox': np.stack([sub['x1'], sub['y1'], sub['x2'], sub['y2']], axis=1),
+            'class_id': sub['class_id'],
+            'confidence': sub['confidence'],
+        }
+
+    return columns(records['kind'] == KIND_DETECTION), columns(records['kind'] == KIND_TRACK)
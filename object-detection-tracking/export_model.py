@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import time
+import cv2
+import numpy as np
+from ultralytics import YOLO
+from detector import ObjectDetector
+
+
+def export_model(model_path, fmt, imgsz, int8):
+    exported = YOLO(model_path).export(format=fmt, imgsz=imgsz,
+                                       int8=(int8 and fmt == 'openvino'))
+    paths = [exported]
+
+    if int8 and fmt == 'onnx':
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = exported.replace('.onnx', '_int8.onnx')
+        quantize_dynamic(exported, int8_path, weight_type=QuantType.QUInt8)
+        paths.append(int8_path)
+
+    return paths
+
+
+def read_frames(source, max_frames, size=(640, 480)):
+    frames = []
+    if source:
+        cap = cv2.VideoCapture(source)
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+
+    if not frames:
+        # No footage available: validation still exercises the full graph
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+                  for _ in range(max_frames)]
+    return frames
+
+
+def validate(detector, frame):
+    detections = detector.detect(frame)
+    for det in detections:
+        assert set(det) == {'bbox', 'confidence', 'class', 'class_id'}, det
+        x1, y1, x2, y2 = det['bbox']
+        assert 0 <= x1 <= x2 <= frame.shape[1] and 0 <= y1 <= y2 <= frame.shape[0], det
+    return len(detections)
+
+
+def box_iou(box, boxes):
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def mean_average_precision(predictions, references, iou_threshold=0.5):
+    """mAP@iou of per-frame `predictions` scored against per-frame `references`.
+
+    Both are lists (one entry per frame) of detection lists as returned by
+    `ObjectDetector.detect`. References are treated as ground truth.
+    """
+    classes = {d['class_id'] for frame in references for d in frame}
+    if not classes:
+        return 1.0
+
+    aps = []
+    for cls in classes:
+        gt = {i: np.array([d['bbox'] for d in frame if d['class_id'] == cls], dtype=np.float64)
+              for i, frame in enumerate(references)}
+        matched = {i: np.zeros(len(boxes), dtype=bool) for i, boxes in gt.items()}
+        n_gt = sum(len(boxes) for boxes in gt.values())
+
+        preds = [(d['confidence'], i, d['bbox']) for i, frame in enumerate(predictions)
+                 for d in frame if d['class_id'] == cls]
+        preds.sort(key=lambda p: -p[0])
+
+        tp = np.zeros(len(preds))
+        for k, (_, i, bbox) in enumerate(preds):
+            if len(gt[i]) == 0:
+                continue
+            ious = box_iou(np.array(bbox, dtype=np.float64), gt[i])
+            best = int(ious.argmax())
+            if ious[best] >= iou_threshold and not matched[i][best]:
+                matched[i][best] = True
+                tp[k] = 1
+
+        tp_cum = np.cumsum(tp)
+        recall = tp_cum / n_gt
+        precision = tp_cum / np.arange(1, len(preds) + 1)
+        recall = np.concatenate([[0.0], recall, [1.0]])
+        precision = np.concatenate([[1.0], precision, [0.0]])
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        aps.append(float(np.sum(np.diff(recall) * precision[1:])))
+
+    return float(np.mean(aps))
+
+
+def benchmark(model_paths, frames, conf, num_threads, warmup=5):
+    results = {}
+    reference = None
+
+    for path in model_paths:
+        detector = ObjectDetector(model_path=path, conf_threshold=conf, num_threads=num_threads)
+        for frame in frames[:warmup]:
+            detector.detect(frame)
+
+        latencies = []
+        outputs = []
+        for frame in frames:
+            start = time.perf_counter()
+            outputs.append(detector.detect(frame))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        # The first model (the PyTorch weights) is the accuracy reference
+        if reference is None:
+            reference = outputs
+
+        latencies = np.array(latencies)
+        results[path] = {
+            'mean_ms': round(float(latencies.mean()), 2),
+            'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+            'p95_ms': round(float(np.percentile(latencies, 95)), 2),
+            'fps': round(float(1000 / latencies.mean()), 1),
+            'map50_vs_reference': round(mean_average_precision(outputs, reference), 4),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export YOLOv8 for CPU inference and benchmark it')
+    parser.add_argument('--model', type=str, default='yolov8n.pt',
+                       help='PyTorch YOLOv8 weights to export')
+    parser.add_argument('--format', type=str, default='onnx', choices=['onnx', 'openvino'],
+                       help='Export format')
+    parser.add_argument('--imgsz', type=int, default=640,
+                       help='Exported model input size')
+    parser.add_argument('--int8', action='store_true',
+                       help='Also produce an int8-quantized variant')
+    parser.add_argument('--source', type=str, default=None,
+                       help='Video used for validation and benchmarking (random frames if omitted)')
+    parser.add_argument('--frames', type=int, default=100,
+                       help='Number of frames to benchmark')
+    parser.add_argument('--conf', type=float, default=0.25,
+                       help='Confidence threshold used while benchmarking')
+    parser.add_argument('--threads', type=int, default=None,
+                       help='Intra-op thread count for all backends')
+    parser.add_argument('--report', type=str, default=None,
+                       help='Optional path to write the benchmark results as JSON')
+
+    args = parser.parse_args()
+
+    print(f"Exporting {args.model} to {args.format}...")
+    exported = export_model(args.model, args.format, args.imgsz, args.int8)
+    for path in exported:
+        print(f"  {path}")
+
+    frames = read_frames(args.source, args.frames)
+
+    print("\nValidating exported models...")
+    for path in exported:
+        detector = ObjectDetector(model_path=path, conf_threshold=args.conf, num_threads=args.threads)
+        count = validate(detector, frames[0])
+        print(f"  {os.path.basename(path)}: OK ({count} detections on first frame)")
+
+    print(f"\nBenchmarking on {len(frames)} frames...")
+    results = benchmark([args.model] + exported, frames, args.conf, args.threads)
+
+    print(f"\n{'Model':40s} {'mean ms':>9s} {'p95 ms':>9s} {'FPS':>7s} {'mAP50 vs .pt':>13s}")
+    print("-" * 82)
+    for path, stats in results.items():
+        print(f"{os.path.basename(path):40s} {stats['mean_ms']:9.2f} {stats['p95_ms']:9.2f} "
+              f"{stats['fps']:7.1f} {stats['map50_vs_reference']:13.4f}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
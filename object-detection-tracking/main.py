@@ -1,9 +1,73 @@
 import cv2
-import time
+import os
 import argparse
-from detector import ObjectDetector
+import time
+import multiprocessing as mp
+from detector import ObjectDetector, parse_roi, roi_crop
 from tracker import ObjectTracker
-from utils import draw_tracks, display_info
+from utils import draw_tracks, draw_zones, display_info
+from export import ResultExporter
+from cache import DetectionCache
+from profiler import StageProfiler
+from shm_ring import FrameRing, read_multiprocess, stop_workers, wait_for_workers
+from track_history import TrackHistory, parse_lines
+
+
+def detection_worker(ring_spec, detector_kwargs, tasks, results):
+    ring = FrameRing.attach(ring_spec)
+    detector = ObjectDetector(**detector_kwargs)
+    results.put(('ready', detector.class_names))
+    
+    while True:
+        seq = tasks.get()
+        if seq is None:
+            break
+        frame = ring.read(seq)
+        detections = detector.detect(frame) if frame is not None else []
+        results.put((seq, detections))
+    
+    ring.close()
+
+
+def frame_clock(live):
+    """Returns a function giving the time of the frame `cap` just decoded, in seconds.
+
+    Files use the stream position; live sources use the wall clock, since
+    their nominal FPS says nothing about when frames actually arrive.
+    """
+    if not live:
+        return lambda cap: cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+    
+    start = None
+    
+    def live_clock(cap):
+        # Counted from the first frame, not from model loading
+        nonlocal start
+        now = time.monotonic()
+        if start is None:
+            start = now
+        return now - start
+    
+    return live_clock
+
+
+def read_local(cap, detector, cache, profiler, clock):
+    frame_idx = 0
+    while True:
+        with profiler.stage('decode'):
+            ret, frame = cap.read()
+            timestamp = clock(cap)
+        if not ret:
+            return
+        
+        with profiler.stage('detect'):
+            if detector is None:
+                detections = cache.get(frame_idx)
+            else:
+                detections = detector.detect(frame)
+        frame_idx += 1
+        
+        yield frame, timestamp, detections
 
 
 def main():
@@ -15,76 +79,210 @@ def main():
     parser.add_argument('--conf', type=float, default=0.5, 
                        help='Confidence threshold for detection')
     parser.add_argument('--model', type=str, default='yolov8n.pt', 
-                       help='YOLOv8 model path')
+                       help='YOLOv8 model path (.pt, exported .onnx, or OpenVINO .xml / model dir)')
+    parser.add_argument('--threads', type=int, default=None,
+                       help='Number of CPU threads used for inference')
+    parser.add_argument('--imgsz', type=int, default=640,
+                       help='Inference image size (smaller is faster, less accurate)')
+    parser.add_argument('--roi', type=str, default=None,
+                       help='Regions to detect in: "x1,y1,x2,y2" crops or "x1,y1,x2,y2,x3,y3,..." polygons, separated by ";"')
     parser.add_argument('--show-conf', action='store_true',
                        help='Show confidence scores on labels')
+    parser.add_argument('--overlay-alpha', type=float, default=None,
+                       help='Blend annotations onto the frame with this opacity (0.0-1.0)')
     parser.add_argument('--classes', type=str, default=None,
                        help='Filter by class names (comma-separated), e.g., "person,car,dog"')
+    parser.add_argument('--export', type=str, default=None,
+                       help='Stream detections and tracks to a file (.jsonl, otherwise columnar .npy chunks)')
+    parser.add_argument('--export-batch', type=int, default=64,
+                       help='Number of frames buffered before each export write')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='Directory for cached detections; reruns on the same video skip inference')
+    parser.add_argument('--stats', type=str, default=None,
+                       help='Periodically write per-stage timing stats to this JSON file')
+    parser.add_argument('--stats-interval', type=float, default=5.0,
+                       help='Seconds between stats file updates')
+    parser.add_argument('--workers', type=int, default=0,
+                       help='Run detection in this many worker processes fed through shared memory')
+    parser.add_argument('--ring-slots', type=int, default=None,
+                       help='Shared-memory frame slots for --workers (default: 2 per worker)')
+    parser.add_argument('--zones', type=str, default=None,
+                       help='Zones to count entries and dwell time in, same format as --roi')
+    parser.add_argument('--lines', type=str, default=None,
+                       help='Counting lines "x1,y1,x2,y2", separated by ";"')
+    parser.add_argument('--history', type=int, default=300,
+                       help='Positions kept per track for zone, line and trajectory queries')
+    parser.add_argument('--max-tracks', type=int, default=512,
+                       help='Tracks kept in the history at once (least recently seen are evicted)')
+    parser.add_argument('--events', type=str, default=None,
+                       help='Write zone/line counts, dwell times and the event log to this JSON file')
     
     args = parser.parse_args()
     
-    detector = ObjectDetector(model_path=args.model, conf_threshold=args.conf)
-    tracker = ObjectTracker(max_age=30)
+    source = int(args.source) if args.source.isdigit() else args.source
+    roi = parse_roi(args.roi) if args.roi else None
     
-    class_filter = None
-    if args.classes:
-        class_filter = [c.strip().lower() for c in args.classes.split(',')]
+    cache = None
+    if args.cache_dir and isinstance(source, str) and os.path.isfile(source):
+        cache = DetectionCache(args.cache_dir, source, args.model, args.conf,
+                               imgsz=args.imgsz, roi=args.roi)
     
-    source = int(args.source) if args.source.isdigit() else args.source
     cap = cv2.VideoCapture(source)
     
     if not cap.isOpened():
         print(f"Error: Cannot open video source {args.source}")
         return
     
-    fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
+    live = not (isinstance(source, str) and os.path.isfile(source))
+    # Keep the fractional rate (29.97 etc.) so dwell times do not drift
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     
-    writer = None
-    if args.output:
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(args.output, fourcc, fps, (width, height))
+    if roi and width and height:
+        try:
+            roi_crop(roi, (height, width))
+        except ValueError as e:
+            print(f"Error: Invalid --roi: {e}")
+            cap.release()
+            return
     
-    print("Starting detection and tracking...")
-    print("Press 'q' to quit")
+    detector_kwargs = dict(model_path=args.model, conf_threshold=args.conf,
+                           num_threads=args.threads, imgsz=args.imgsz, roi=roi)
+    profiler = StageProfiler(frame_budget=1 / fps)
+    clock = frame_clock(live)
     
-    prev_time = time.time()
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+    ring = None
+    workers = []
+    frames = None
+    tasks = None
+    writer = None
+    exporter = None
+    history = None
+    finished = False
+    try:
+        use_cache = cache is not None and cache.exists()
+        if use_cache:
+            cache.load()
+            class_names = cache.class_names
+            frames = read_local(cap, None, cache, profiler, clock)
+            print(f"Using cached detections ({len(cache)} frames)")
+        elif args.workers > 0:
+            if not detector_kwargs['num_threads']:
+                detector_kwargs['num_threads'] = max(1, (os.cpu_count() or 1) // args.workers)
+            ring = FrameRing((height, width, 3), slots=args.ring_slots or 2 * args.workers)
+            ctx = mp.get_context('spawn')
+            tasks = ctx.Queue()
+            results = ctx.Queue()
+            workers = [ctx.Process(target=detection_worker, daemon=True,
+                                   args=(ring.spec(), detector_kwargs, tasks, results))
+                       for _ in range(args.workers)]
+            for w in workers:
+                w.start()
+            class_names = wait_for_workers(results, workers)
+            frames = read_multiprocess(cap, ring, tasks, results, workers, profiler, clock)
+            print(f"Running detection in {args.workers} worker processes")
+        else:
+            detector = ObjectDetector(**detector_kwargs)
+            class_names = detector.class_names
+            frames = read_local(cap, detector, None, profiler, clock)
+        tracker = ObjectTracker(max_age=30)
         
-        detections = detector.detect(frame)
+        class_filter = None
+        if args.classes:
+            class_filter = [c.strip().lower() for c in args.classes.split(',')]
         
-        if class_filter:
-            detections = [d for d in detections if d['class'].lower() in class_filter]
+        if args.output:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            writer = cv2.VideoWriter(args.output, fourcc, fps, (width, height))
         
-        tracks = tracker.update_tracks(detections, frame)
-        tracked_objects = tracker.get_tracked_objects(tracks, detector.class_names, detections)
+        if args.export:
+            exporter = ResultExporter(args.export, batch_frames=args.export_batch)
         
-        frame = draw_tracks(frame, tracked_objects, args.show_conf)
+        if args.zones or args.lines or args.events:
+            zones = [(f"zone{i + 1}", p) for i, p in enumerate(parse_roi(args.zones))] if args.zones else []
+            lines = [(f"line{i + 1}", l) for i, l in enumerate(parse_lines(args.lines))] if args.lines else []
+            history = TrackHistory((width, height), zones, lines, max_tracks=args.max_tracks,
+                                   history=args.history, max_age=30)
         
-        curr_time = time.time()
-        fps_display = 1 / (curr_time - prev_time)
-        prev_time = curr_time
+        print("Starting detection and tracking...")
+        print("Press 'q' to quit")
         
-        frame = display_info(frame, fps_display, len(tracked_objects))
+        frame_idx = 0
+        # Model loading and worker startup are done; time only the frame loop
+        profiler.start()
         
-        cv2.imshow('Object Detection and Tracking', frame)
+        for frame, timestamp, detections in frames:
+            if cache is not None and not use_cache:
+                cache.add(detections)
         
-        if writer:
-            writer.write(frame)
+            if class_filter:
+                detections = [d for d in detections if d['class'].lower() in class_filter]
         
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+            with profiler.stage('update_tracks'):
+                tracks = tracker.update_tracks(detections, frame)
+            with profiler.stage('get_tracked_objects'):
+                tracked_objects = tracker.get_tracked_objects(tracks, class_names, detections)
+        
+            if exporter:
+                with profiler.stage('export'):
+                    exporter.add_frame(frame_idx, timestamp, detections, tracked_objects)
+        
+            if history is not None:
+                with profiler.stage('history'):
+                    history.update(frame_idx, tracked_objects)
+            frame_idx += 1
+        
+            with profiler.stage('draw'):
+                frame = draw_tracks(frame, tracked_objects, args.show_conf, args.overlay_alpha)
+                if history is not None:
+                    frame = draw_zones(frame, history)
+                frame = display_info(frame, profiler.fps, len(tracked_objects))
+        
+            with profiler.stage('display'):
+                cv2.imshow('Object Detection and Tracking', frame)
+                key = cv2.waitKey(1) & 0xFF
+        
+            if writer:
+                with profiler.stage('encode'):
+                    writer.write(frame)
+        
+            profiler.end_frame()
+            if args.stats:
+                profiler.maybe_dump(args.stats, args.stats_interval)
+        
+            if key == ord('q'):
+                break
+        else:
+            finished = True
+    finally:
+        # Always stop the workers and unlink the shared memory, also when a
+        # worker died or tracking/drawing raised
+        if frames is not None:
+            frames.close()
+        frame = None
+        if workers:
+            stop_workers(tasks, workers)
+        if ring is not None:
+            ring.close()
+        cap.release()
+        if writer:
+            writer.release()
+        if exporter:
+            exporter.close()
+        cv2.destroyAllWindows()
+    
+    if cache is not None and not use_cache and finished:
+        cache.save(class_names)
     
-    cap.release()
-    if writer:
-        writer.release()
-    cv2.destroyAllWindows()
+    if history is not None and args.events:
+        history.dump(args.events, fps)
+    if history is not None and history.dropped:
+        print(f"Warning: skipped {history.dropped} track updates over --max-tracks {args.max_tracks}")
     
+    if args.stats:
+        profiler.dump(args.stats)
+    print(profiler.report())
     print("Processing completed!")
 
 
@@ -0,0 +1,134 @@
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class StageProfiler:
+    """Per-frame stage timings with rolling percentiles and a smoothed FPS.
+
+    Wrap each pipeline stage in `with profiler.stage(name):` and call
+    `end_frame()` once per frame. Mean and max cover the whole run, while
+    p50/p95 are taken over the last `window` frames; a frame counts as
+    dropped when its total processing time exceeds `frame_budget` seconds
+    (normally 1 / source FPS).
+    """
+
+    def __init__(self, window=300, frame_budget=None, smoothing=0.1):
+        self.window = window
+        self.frame_budget = frame_budget
+        self.smoothing = smoothing
+
+        self.samples = {}
+        self.totals = deque(maxlen=window)
+        # Whole-run [count, sum, max] per stage, plus 'total'
+        self.running = {}
+        self.frames = 0
+        self.dropped = 0
+        self.start_time = time.perf_counter()
+
+        self._current = {}
+        self._last_frame_end = None
+        self._interval = None
+        self._last_dump = self.start_time
+
+    def start(self):
+        """Restarts the clock, so setup before the first frame is not counted."""
+        self.start_time = time.perf_counter()
+        self._last_dump = self.start_time
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+
+    def end_frame(self):
+        now = time.perf_counter()
+        total = 0.0
+        for name, duration in self._current.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(duration)
+            self._accumulate(name, duration)
+            total += duration
+        self._current = {}
+
+        self.totals.append(total)
+        self._accumulate('total', total)
+        self.frames += 1
+        if self.frame_budget and total > self.frame_budget:
+            self.dropped += 1
+
+        # Smooth the frame interval rather than the instantaneous FPS, so a
+        # single very short interval cannot blow the estimate up.
+        if self._last_frame_end is not None:
+            interval = now - self._last_frame_end
+            if self._interval is None:
+                self._interval = interval
+            else:
+                self._interval += self.smoothing * (interval - self._interval)
+        self._last_frame_end = now
+
+    def _accumulate(self, name, duration):
+        running = self.running.setdefault(name, [0, 0.0, 0.0])
+        running[0] += 1
+        running[1] += duration
+        running[2] = max(running[2], duration)
+
+    @property
+    def fps(self):
+        if not self._interval:
+            return 0.0
+        return 1.0 / max(self._interval, 1e-6)
+
+    def summary(self):
+        def stats(name, values):
+            count, total, peak = self.running[name]
+            values = np.fromiter(values, dtype=np.float64) * 1000
+            return {
+                'mean_ms': round(total / count * 1000, 3),
+                'p50_ms': round(float(np.percentile(values, 50)), 3),
+                'p95_ms': round(float(np.percentile(values, 95)), 3),
+                'max_ms': round(peak * 1000, 3),
+                'window_frames': len(values),
+            }
+
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'elapsed_s': round(elapsed, 3),
+            'average_fps': round(self.frames / elapsed, 2) if elapsed > 0 else 0.0,
+            'smoothed_fps': round(self.fps, 2),
+            'stages': {name: stats(name, values) for name, values in self.samples.items() if values},
+            'total': stats('total', self.totals) if self.totals else {},
+        }
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def maybe_dump(self, path, interval):
+        now = time.perf_counter()
+        if now - self._last_dump >= interval:
+            self.dump(path)
+            self._last_dump = now
+
+    def report(self):
+        summary = self.summary()
+        lines = [
+            f"Frames: {summary['frames']} | Dropped (over budget): {summary['dropped']} | "
+            f"Average FPS: {summary['average_fps']:.1f}",
+            f"Mean over all frames; p50/p95 over the last {min(self.frames, self.window)} frames",
+            f"{'Stage':22s} {'mean ms':>9s} {'p50 ms':>9s} {'p95 ms':>9s}",
+        ]
+        rows = list(summary['stages'].items())
+        if summary['total']:
+            rows.append(('total', summary['total']))
+        for name, stats in rows:
+            lines.append(f"{name:22s} {stats['mean_ms']:9.2f} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f}")
+        return '\n'.join(lines)
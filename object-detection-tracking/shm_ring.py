@@ -0,0 +1,135 @@
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class FrameRing:
+    """Fixed-size ring of frame slots in shared memory.
+
+    The capture process writes frames straight into `slot_view(seq)` and
+    then `commit(seq)`s them; worker processes attach by name with
+    `FrameRing.attach(ring.spec())` and read frames as NumPy views, so only
+    the sequence number has to cross the process boundary. Each slot stores
+    the sequence number of the frame it holds, which lets readers detect a
+    slot that has already been reused for a newer frame.
+    """
+
+    def __init__(self, shape, slots=8, dtype=np.uint8, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        header_size = slots * np.dtype(np.int64).itemsize
+        frame_size = int(np.prod(self.shape)) * self.dtype.itemsize
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_size + slots * frame_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.seqs = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype,
+                                 buffer=self.shm.buf, offset=header_size)
+        if self.owner:
+            self.seqs[:] = -1
+
+    def spec(self):
+        return self.shm.name, self.shape, self.slots, self.dtype.str
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, slots, dtype = spec
+        return cls(shape, slots, dtype, name=name)
+
+    def slot_view(self, seq):
+        return self.frames[seq % self.slots]
+
+    def commit(self, seq):
+        self.seqs[seq % self.slots] = seq
+
+    def read(self, seq):
+        slot = seq % self.slots
+        if self.seqs[slot] != seq:
+            return None
+        return self.frames[slot]
+
+    def close(self):
+        # Drop our own views first; exported buffers block closing the mapping
+        self.seqs = None
+        self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a frame view; the mapping is released
+            # when that view is garbage collected.
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+def wait_for_workers(results, workers, timeout=1.0):
+    """Waits for every worker's ('ready', payload) message; returns the last payload."""
+    payload = None
+    ready = 0
+    while ready < len(workers):
+        try:
+            _, payload = results.get(timeout=timeout)
+        except queue.Empty:
+            if not all(w.is_alive() for w in workers):
+                raise RuntimeError("A detection worker exited during startup; see its error above")
+            continue
+        ready += 1
+    return payload
+
+
+def stop_workers(tasks, workers, timeout=5.0):
+    for _ in workers:
+        tasks.put(None)
+    for w in workers:
+        w.join(timeout)
+        if w.is_alive():
+            w.terminate()
+            w.join()
+
+
+def read_multiprocess(cap, ring, tasks, results, workers, profiler, clock):
+    # Frames are decoded straight into ring slots and only their sequence
+    # numbers are sent to the workers. A slot is reused only after its frame
+    # has been yielded back, so at most `ring.slots` frames are in flight.
+    # Timestamps are taken at decode time, as the reader runs ahead.
+    next_seq = 0
+    done_seq = 0
+    pending = {}
+    timestamps = {}
+    eof = False
+    
+    while True:
+        with profiler.stage('decode'):
+            while not eof and next_seq - done_seq < ring.slots:
+                slot = ring.slot_view(next_seq)
+                ret, frame = cap.read(slot)
+                if not ret:
+                    eof = True
+                    break
+                if not np.shares_memory(frame, slot):
+                    np.copyto(slot, frame)
+                ring.commit(next_seq)
+                timestamps[next_seq] = clock(cap)
+                tasks.put(next_seq)
+                next_seq += 1
+        
+        if done_seq == next_seq:
+            return
+        
+        with profiler.stage('detect'):
+            while done_seq not in pending:
+                try:
+                    seq, detections = results.get(timeout=1.0)
+                except queue.Empty:
+                    if not all(w.is_alive() for w in workers):
+                        raise RuntimeError("A detection worker exited unexpectedly")
+                    continue
+                pending[seq] = detections
+        
+        yield ring.slot_view(done_seq), timestamps.pop(done_seq), pending.pop(done_seq)
+        done_seq += 1
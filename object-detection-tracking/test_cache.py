@@ -0,0 +1,62 @@
+from cache import DetectionCache
+
+
+CLASS_NAMES = {0: 'person', 2: 'car'}
+
+FRAMES = [
+    [{'bbox': [10, 20, 50, 80], 'confidence': 0.875, 'class': 'person', 'class_id': 0}],
+    [],
+    [{'bbox': [100, 100, 140, 160], 'confidence': 0.5, 'class': 'car', 'class_id': 2},
+     {'bbox': [0, 0, 5, 5], 'confidence': 0.25, 'class': 'person', 'class_id': 0}],
+    [],
+]
+
+
+def make_cache(tmp_path, content=b'video bytes', **kwargs):
+    video = tmp_path / 'video.mp4'
+    video.write_bytes(content)
+    return DetectionCache(str(tmp_path / 'cache'), str(video), 'yolov8n.pt', 0.5, **kwargs)
+
+
+def test_round_trip_keeps_empty_frames(tmp_path):
+    cache = make_cache(tmp_path)
+    for detections in FRAMES:
+        cache.add(detections)
+    cache.save(CLASS_NAMES)
+
+    loaded = make_cache(tmp_path)
+    assert loaded.exists()
+    loaded.load()
+
+    assert len(loaded) == len(FRAMES)
+    assert loaded.class_names == CLASS_NAMES
+    assert [loaded.get(i) for i in range(len(FRAMES))] == FRAMES
+    assert loaded.get(len(FRAMES)) == []
+
+
+def test_all_frames_empty(tmp_path):
+    cache = make_cache(tmp_path)
+    for _ in range(3):
+        cache.add([])
+    cache.save(CLASS_NAMES)
+
+    cache.load()
+    assert len(cache) == 3
+    assert [cache.get(i) for i in range(3)] == [[], [], []]
+
+
+def test_exists_only_after_save(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add(FRAMES[0])
+    assert not cache.exists()
+
+    cache.save(CLASS_NAMES)
+    assert cache.exists()
+
+
+def test_key_depends_on_video_and_settings(tmp_path):
+    key = make_cache(tmp_path).key
+    assert make_cache(tmp_path).key == key
+    assert make_cache(tmp_path, content=b'other video').key != key
+    assert make_cache(tmp_path, imgsz=320).key != key
+    assert make_cache(tmp_path, roi='0,0,100,100').key != key
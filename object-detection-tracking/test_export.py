@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from export import ResultExporter, load_results
+
+
+FRAMES = [
+    ([{'bbox': [10, 20, 50, 80], 'confidence': 0.9, 'class': 'person', 'class_id': 0}],
+     [{'bbox': [11, 21, 51, 81], 'confidence': 0.9, 'track_id': '3', 'class_id': 0}]),
+    ([], []),
+    ([{'bbox': [100, 100, 140, 160], 'confidence': 0.5, 'class': 'car', 'class_id': 2},
+      {'bbox': [0, 0, 5, 5], 'confidence': 0.25, 'class': 'dog', 'class_id': 16}],
+     [{'bbox': [99, 99, 141, 161], 'confidence': 0.5, 'track_id': None, 'class_id': None}]),
+]
+
+
+def write(path, frames, batch_frames=2):
+    with ResultExporter(path, batch_frames=batch_frames) as exporter:
+        for frame_idx, (detections, tracked_objects) in enumerate(frames):
+            exporter.add_frame(frame_idx, frame_idx / 29.97, detections, tracked_objects)
+
+
+@pytest.mark.parametrize('name', ['results.jsonl', 'results.npy'])
+def test_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    write(path, FRAMES)
+    detections, tracks = load_results(path)
+
+    assert detections['frame'].tolist() == [0, 2, 2]
+    assert detections['bbox'].tolist() == [[10, 20, 50, 80], [100, 100, 140, 160], [0, 0, 5, 5]]
+    assert detections['class_id'].tolist() == [0, 2, 16]
+    assert detections['confidence'] == pytest.approx([0.9, 0.5, 0.25])
+    assert detections['timestamp'] == pytest.approx([0, 2 / 29.97, 2 / 29.97], abs=1e-4)
+
+    # Tracks without a numeric ID or class are stored as -1
+    assert tracks['frame'].tolist() == [0, 2]
+    assert tracks['track_id'].tolist() == [3, -1]
+    assert tracks['class_id'].tolist() == [0, -1]
+    assert tracks['bbox'].tolist() == [[11, 21, 51, 81], [99, 99, 141, 161]]
+
+
+@pytest.mark.parametrize('name', ['results.jsonl', 'results.npy'])
+def test_empty_export(tmp_path, name):
+    path = str(tmp_path / name)
+    write(path, [([], [])] * 3)
+    detections, tracks = load_results(path)
+
+    for columns in (detections, tracks):
+        assert len(columns['frame']) == 0
+        assert columns['bbox'].shape == (0, 4)
+
+
+def test_columnar_chunks_are_concatenated(tmp_path):
+    path = str(tmp_path / 'results.npy')
+    write(path, FRAMES * 4, batch_frames=1)
+    detections, tracks = load_results(path)
+
+    assert len(detections['frame']) == 12
+    assert np.array_equal(tracks['track_id'], [3, -1] * 4)
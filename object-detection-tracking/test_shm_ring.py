@@ -0,0 +1,102 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import pytest
+from profiler import StageProfiler
+from shm_ring import FrameRing, read_multiprocess, stop_workers, wait_for_workers
+
+
+SHAPE = (48, 64, 3)
+
+
+class FakeCapture:
+    """Writes frame i as a constant image of value i % 256 into the given slot."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.reads = 0
+
+    def read(self, out):
+        if self.reads == self.frames:
+            return False, None
+        out[:] = self.reads % 256
+        self.reads += 1
+        return True, out
+
+
+def echo_worker(ring_spec, tasks, results):
+    ring = FrameRing.attach(ring_spec)
+    results.put(('ready', 'echo'))
+    while True:
+        seq = tasks.get()
+        if seq is None:
+            break
+        frame = ring.read(seq)
+        results.put((seq, None if frame is None else int(frame.mean())))
+    ring.close()
+
+
+def failing_worker(ring_spec, tasks, results):
+    raise RuntimeError("model failed to load")
+
+
+def start_workers(target, ring, count):
+    ctx = mp.get_context('spawn')
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    workers = [ctx.Process(target=target, daemon=True, args=(ring.spec(), tasks, results))
+               for _ in range(count)]
+    for w in workers:
+        w.start()
+    return tasks, results, workers
+
+
+def test_round_trip_keeps_order_and_bounds_frames_in_flight():
+    ring = FrameRing(SHAPE, slots=4)
+    tasks, results, workers = start_workers(echo_worker, ring, 2)
+    cap = FakeCapture(frames=50)
+    try:
+        assert wait_for_workers(results, workers) == 'echo'
+
+        received = []
+        frames = read_multiprocess(cap, ring, tasks, results, workers, StageProfiler(),
+                                   clock=lambda cap: cap.reads / 10)
+        for i, (frame, timestamp, value) in enumerate(frames):
+            assert cap.reads - i <= ring.slots
+            assert frame.shape == SHAPE and frame[0, 0, 0] == i % 256
+            assert timestamp == (i + 1) / 10
+            received.append(value)
+            frame = None
+        frames.close()
+    finally:
+        stop_workers(tasks, workers)
+        ring.close()
+
+    assert received == [i % 256 for i in range(50)]
+    assert all(w.exitcode == 0 for w in workers)
+
+
+def test_read_detects_reused_slot():
+    ring = FrameRing(SHAPE, slots=2)
+    try:
+        ring.slot_view(0)[:] = 7
+        ring.commit(0)
+        assert ring.read(0)[0, 0, 0] == 7
+        ring.commit(2)
+        assert ring.read(0) is None
+    finally:
+        ring.close()
+
+
+def test_worker_startup_failure_raises_and_ring_unlinks():
+    ring = FrameRing(SHAPE, slots=2)
+    name = ring.shm.name
+    tasks, results, workers = start_workers(failing_worker, ring, 1)
+    try:
+        with pytest.raises(RuntimeError):
+            wait_for_workers(results, workers, timeout=0.2)
+    finally:
+        stop_workers(tasks, workers)
+        ring.close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,90 @@
+import pytest
+from track_history import TrackHistory
+
+
+ZONE = [(100, 100), (200, 100), (200, 200), (100, 200)]
+
+
+def obj(track_id, x, y, size=20):
+    # Boxes are anchored at their bottom center, so (x, y) is the track position
+    return {'track_id': track_id, 'bbox': [x - size // 2, y - size, x + size // 2, y], 'class_id': 0}
+
+
+def make_history(**kwargs):
+    return TrackHistory((640, 480), zones=[('zone1', ZONE)], lines=[('line1', [300, 0, 300, 480])],
+                        **kwargs)
+
+
+def test_zone_enter_exit_and_dwell():
+    history = make_history()
+    path = [50, 150, 150, 150, 250, 150, 160, 250]
+    events = []
+    for frame_idx, x in enumerate(path):
+        events += history.update(frame_idx, [obj(1, x, 150)])
+
+    assert [(e['type'], e['frame']) for e in events] == \
+        [('enter', 1), ('exit', 4), ('enter', 5), ('exit', 7)]
+    assert [e['dwell_frames'] for e in events if e['type'] == 'exit'] == [3, 2]
+    assert history.dwell_frames('zone1') == {1: 5}
+
+    summary = history.summary(fps=2)
+    assert summary['zones']['zone1'] == {'entries': 2, 'occupancy': 0, 'dwell_seconds': 2.5,
+                                         'mean_dwell_seconds': 1.25}
+
+
+def test_dwell_totals_survive_event_log_rollover():
+    history = make_history(max_events=4)
+    for visit in range(10):
+        base = visit * 4
+        history.update(base, [obj(visit, 150, 150)])
+        history.update(base + 1, [obj(visit, 150, 150)])
+        history.update(base + 2, [obj(visit, 50, 150)])
+
+    assert len(history.events) == 4
+    zone = history.summary()['zones']['zone1']
+    assert zone['entries'] == 10
+    assert history.total_dwell_frames('zone1') == 20
+
+
+def test_line_crossing_direction():
+    history = make_history()
+    for frame_idx, x in enumerate([280, 320, 330, 290]):
+        history.update(frame_idx, [obj(7, x, 300)])
+
+    crossings = history.crossings('line1')
+    assert [(track_id, frame) for track_id, frame, _ in crossings] == [(7, 1), (7, 3)]
+    assert crossings[0][2] == -crossings[1][2]
+    assert history.summary()['lines']['line1'] == {'positive': 1, 'negative': 1}
+
+
+def test_stale_tracks_are_released_and_oldest_evicted():
+    history = make_history(max_tracks=2, max_age=5)
+    history.update(0, [obj(1, 150, 150)])
+    history.update(1, [obj(2, 400, 400)])
+    history.update(2, [obj(2, 400, 400), obj(3, 420, 400)])
+
+    assert len(history) == 2
+    assert len(history.trajectory(1)[0]) == 0
+    assert [e['type'] for e in history.events] == ['enter', 'exit']
+
+    history.update(20, [obj(4, 50, 50)])
+    assert len(history) == 1
+
+
+def test_tracks_over_capacity_in_one_frame_are_skipped():
+    history = make_history(max_tracks=2)
+    history.update(0, [obj(i, 50 + 40 * i, 300) for i in range(4)])
+
+    assert len(history) == 2
+    assert history.dropped == 2
+    assert history.summary()['dropped_tracks'] == 2
+
+
+def test_trajectory_keeps_last_positions():
+    history = make_history(history=3)
+    for frame_idx in range(5):
+        history.update(frame_idx, [obj(1, 10 * frame_idx + 10, 50)])
+
+    frames, points = history.trajectory(1)
+    assert frames.tolist() == [2, 3, 4]
+    assert points[:, 0].tolist() == pytest.approx([30, 40, 50])
@@ -0,0 +1,349 @@
+import json
+from collections import deque
+import cv2
+import numpy as np
+
+
+def parse_lines(spec):
+    """Parses "x1,y1,x2,y2" counting lines separated by ';' into an (N, 4) array."""
+    lines = []
+    for part in spec.split(';'):
+        values = [float(v) for v in part.split(',') if v.strip()]
+        if len(values) != 4:
+            raise ValueError(f"Invalid line '{part}': expected x1,y1,x2,y2")
+        lines.append(values)
+    return np.array(lines, dtype=np.float64)
+
+
+def points_in_polygon(points, polygon):
+    """Even-odd ray casting test of (N, 2) points against one polygon."""
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    spans = (y1 > y) != (y2 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    return (spans & (x < x_cross)).sum(axis=1) % 2 == 1
+
+
+def _cross(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+class TrackHistory:
+    """Bounded per-track trajectories with zone and line-crossing events.
+
+    Every track gets a slot in preallocated arrays holding a ring buffer of
+    its last `history` positions, so memory stays fixed at `max_tracks` x
+    `history` points however long the stream runs. Tracks unseen for
+    `max_age` frames free their slot; if all slots are taken, the least
+    recently seen track is evicted. Tracks beyond `max_tracks` in a single
+    frame are skipped and counted in `dropped`.
+
+    The frame is split into `cell_size` grid cells. Zones and lines are
+    rasterized onto the grid once, so an update only runs the exact
+    point-in-polygon and segment tests for tracks in cells they touch.
+    Positions from the latest update are also bucketed by cell, which keeps
+    region queries independent of the number of tracks elsewhere.
+    """
+
+    def __init__(self, frame_size, zones=(), lines=(), max_tracks=512, history=300, max_age=30,
+                 cell_size=32, anchor='bottom', max_events=10000):
+        width, height = frame_size
+        self.cell_size = cell_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.max_tracks = max_tracks
+        self.history = history
+        self.max_age = max_age
+        self.anchor = anchor
+        self.frame_idx = -1
+        self.dropped = 0
+
+        self.points = np.zeros((max_tracks, history, 2), dtype=np.float32)
+        self.frames = np.full((max_tracks, history), -1, dtype=np.int64)
+        self.head = np.zeros(max_tracks, dtype=np.int32)
+        self.length = np.zeros(max_tracks, dtype=np.int32)
+        self.first_seen = np.full(max_tracks, -1, dtype=np.int64)
+        self.last_seen = np.full(max_tracks, -1, dtype=np.int64)
+        self.class_ids = np.full(max_tracks, -1, dtype=np.int32)
+        self.track_ids = [None] * max_tracks
+        self._slots = {}
+        self._free = list(range(max_tracks - 1, -1, -1))
+
+        self.zone_names = [name for name, _ in zones]
+        self.zone_polygons = [np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+                              for _, polygon in zones]
+        self.zone_cells = np.array([self._rasterize(lambda m, p=p: cv2.fillPoly(m, [p.astype(np.int32)], 1))
+                                    for p in self.zone_polygons], dtype=bool).reshape(-1, self.rows, self.cols)
+        self.zone_entries = np.zeros(len(self.zone_names), dtype=np.int64)
+        # Frames of finished visits: per zone since the start, and per slot
+        # for the tracks currently held
+        self.zone_dwell = np.zeros(len(self.zone_names), dtype=np.int64)
+        self.dwell = np.zeros((max_tracks, len(self.zone_names)), dtype=np.int64)
+        self.inside = np.zeros((max_tracks, len(self.zone_names)), dtype=bool)
+        self.entered_at = np.full((max_tracks, len(self.zone_names)), -1, dtype=np.int64)
+        self.last_inside = np.full((max_tracks, len(self.zone_names)), -1, dtype=np.int64)
+
+        self.line_names = [name for name, _ in lines]
+        self.lines = np.array([line for _, line in lines], dtype=np.float64).reshape(-1, 4)
+        self.line_cells = np.array([self._rasterize(lambda m, l=l: cv2.line(
+            m, (int(l[0]), int(l[1])), (int(l[2]), int(l[3])), 1, thickness=3)) for l in self.lines],
+            dtype=bool).reshape(-1, self.rows, self.cols)
+        # Crossings per line: [to the negative side, to the positive side]
+        self.line_counts = np.zeros((len(self.line_names), 2), dtype=np.int64)
+
+        self.events = deque(maxlen=max_events)
+
+        # Latest positions bucketed by cell, CSR style: slots of cell c are
+        # _grid_slots[_grid_start[c]:_grid_start[c + 1]]
+        self._grid_slots = np.empty(0, dtype=np.int64)
+        self._grid_start = np.zeros(self.rows * self.cols + 1, dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        arrays = (self.points, self.frames, self.head, self.length, self.first_seen,
+                  self.last_seen, self.class_ids, self.inside, self.entered_at, self.last_inside,
+                  self.dwell)
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _rasterize(self, draw):
+        cs = self.cell_size
+        mask = np.zeros((self.rows * cs, self.cols * cs), dtype=np.uint8)
+        draw(mask)
+        return mask.reshape(self.rows, cs, self.cols, cs).any(axis=(1, 3))
+
+    def _cells(self, points):
+        cx = np.clip((points[:, 0] // self.cell_size).astype(np.int64), 0, self.cols - 1)
+        cy = np.clip((points[:, 1] // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return cx, cy
+
+    def _slot_for(self, track_id, class_id, frame_idx, events):
+        slot = self._slots.get(track_id)
+        if slot is None:
+            if not self._free:
+                victim = int(np.argmin(self.last_seen))
+                if self.last_seen[victim] == frame_idx:
+                    return None
+                self._release(victim, events)
+            slot = self._free.pop()
+            self._slots[track_id] = slot
+            self.track_ids[slot] = track_id
+            self.first_seen[slot] = frame_idx
+        self.last_seen[slot] = frame_idx
+        if class_id is not None:
+            self.class_ids[slot] = class_id
+        return slot
+
+    def _release(self, slot, events):
+        for z in np.flatnonzero(self.inside[slot]):
+            self._exit(slot, z, self.last_seen[slot], events)
+        del self._slots[self.track_ids[slot]]
+        self.track_ids[slot] = None
+        self.frames[slot] = -1
+        self.head[slot] = 0
+        self.length[slot] = 0
+        self.first_seen[slot] = -1
+        self.last_seen[slot] = -1
+        self.class_ids[slot] = -1
+        self.dwell[slot] = 0
+        self._free.append(slot)
+
+    def _exit(self, slot, z, frame_idx, events):
+        dwell = int(self.last_inside[slot, z] - self.entered_at[slot, z] + 1)
+        self.zone_dwell[z] += dwell
+        self.dwell[slot, z] += dwell
+        events.append({
+            'frame': int(frame_idx),
+            'type': 'exit',
+            'zone': self.zone_names[z],
+            'track_id': self.track_ids[slot],
+            'dwell_frames': dwell,
+        })
+        self.inside[slot, z] = False
+        self.entered_at[slot, z] = -1
+        self.last_inside[slot, z] = -1
+
+    def update(self, frame_idx, tracked_objects):
+        """Records one frame of tracker output and returns the new events."""
+        self.frame_idx = frame_idx
+        events = []
+
+        stale = np.flatnonzero((self.last_seen >= 0) & (self.last_seen < frame_idx - self.max_age))
+        for slot in stale:
+            self._release(slot, events)
+
+        slots, boxes = [], []
+        for obj in tracked_objects:
+            slot = self._slot_for(obj['track_id'], obj.get('class_id'), frame_idx, events)
+            if slot is None:
+                self.dropped += 1
+                continue
+            slots.append(slot)
+            boxes.append(obj['bbox'])
+        n = len(slots)
+        slots = np.array(slots, dtype=np.int64)
+        boxes = np.array(boxes, dtype=np.float32).reshape(n, 4)
+
+        x = (boxes[:, 0] + boxes[:, 2]) / 2
+        y = boxes[:, 3] if self.anchor == 'bottom' else (boxes[:, 1] + boxes[:, 3]) / 2
+        points = np.stack([x, y], axis=1)
+
+        has_prev = self.length[slots] > 0
+        prev = self.points[slots, (self.head[slots] - 1) % self.history]
+
+        self.points[slots, self.head[slots]] = points
+        self.frames[slots, self.head[slots]] = frame_idx
+        self.head[slots] = (self.head[slots] + 1) % self.history
+        self.length[slots] = np.minimum(self.length[slots] + 1, self.history)
+
+        cx, cy = self._cells(points)
+        cell = cy * self.cols + cx
+        order = np.argsort(cell, kind='stable')
+        self._grid_slots = slots[order]
+        self._grid_start[1:] = np.cumsum(np.bincount(cell, minlength=self.rows * self.cols))
+
+        if self.zone_names and n:
+            self._update_zones(frame_idx, slots, points, cx, cy, events)
+        if self.line_names and has_prev.any():
+            self._update_lines(frame_idx, slots[has_prev], prev[has_prev], points[has_prev], events)
+
+        self.events.extend(events)
+        return events
+
+    def _update_zones(self, frame_idx, slots, points, cx, cy, events):
+        candidates = self.zone_cells[:, cy, cx]
+        for z, name in enumerate(self.zone_names):
+            now = np.zeros(len(slots), dtype=bool)
+            idx = np.flatnonzero(candidates[z])
+            if len(idx):
+                now[idx] = points_in_polygon(points[idx], self.zone_polygons[z])
+            was = self.inside[slots, z]
+
+            for i in np.flatnonzero(was & ~now):
+                self._exit(slots[i], z, frame_idx, events)
+            for i in np.flatnonzero(now & ~was):
+                self.entered_at[slots[i], z] = frame_idx
+                self.zone_entries[z] += 1
+                events.append({'frame': frame_idx, 'type': 'enter', 'zone': name,
+                               'track_id': self.track_ids[slots[i]]})
+
+            self.inside[slots, z] = now
+            self.last_inside[slots[now], z] = frame_idx
+
+    def _update_lines(self, frame_idx, slots, prev, points, events):
+        pcx, pcy = self._cells(prev)
+        cx, cy = self._cells(points)
+        near = self.line_cells[:, pcy, pcx] | self.line_cells[:, cy, cx]
+        # A jump of more than one cell can pass over a line's cells entirely
+        near |= (np.abs(pcx - cx) > 1) | (np.abs(pcy - cy) > 1)
+
+        for l, name in enumerate(self.line_names):
+            idx = np.flatnonzero(near[l])
+            if not len(idx):
+                continue
+            a, b = self.lines[l, :2], self.lines[l, 2:]
+            p, q = prev[idx].astype(np.float64), points[idx].astype(np.float64)
+            side_prev = _cross(b - a, p - a) >= 0
+            side_now = _cross(b - a, q - a) >= 0
+            straddles = _cross(q - p, a - p) * _cross(q - p, b - p) <= 0
+            for i in np.flatnonzero((side_prev != side_now) & straddles):
+                direction = 1 if side_now[i] else -1
+                self.line_counts[l, int(side_now[i])] += 1
+                events.append({'frame': frame_idx, 'type': 'cross', 'line': name,
+                               'track_id': self.track_ids[slots[idx[i]]], 'direction': direction})
+
+    def trajectory(self, track_id):
+        """Returns (frames, points) of a track's retained history, oldest first."""
+        slot = self._slots.get(track_id)
+        if slot is None:
+            return np.empty(0, dtype=np.int64), np.empty((0, 2), dtype=np.float32)
+        n = self.length[slot]
+        idx = (self.head[slot] - n + np.arange(n)) % self.history
+        return self.frames[slot, idx], self.points[slot, idx]
+
+    def tracks_in_rect(self, x1, y1, x2, y2):
+        """Track IDs whose position in the latest update lies inside the rectangle."""
+        (cx1, cx2), (cy1, cy2) = self._cells(np.array([[x1, y1], [x2, y2]], dtype=np.float64))
+        found = []
+        for row in range(cy1, cy2 + 1):
+            start = self._grid_start[row * self.cols + cx1]
+            stop = self._grid_start[row * self.cols + cx2 + 1]
+            found.append(self._grid_slots[start:stop])
+        slots = np.concatenate(found)
+        pts = self.points[slots, (self.head[slots] - 1) % self.history]
+        keep = (pts[:, 0] >= x1) & (pts[:, 0] <= x2) & (pts[:, 1] >= y1) & (pts[:, 1] <= y2)
+        return [self.track_ids[s] for s in slots[keep]]
+
+    def tracks_through(self, polygon, since=None):
+        """Track IDs with any retained position inside `polygon` (from frame `since` on)."""
+        valid = self.frames >= (0 if since is None else since)
+        slot_idx, pos_idx = np.nonzero(valid)
+        hits = points_in_polygon(self.points[slot_idx, pos_idx],
+                                 np.asarray(polygon, dtype=np.float64).reshape(-1, 2))
+        return [self.track_ids[s] for s in np.unique(slot_idx[hits])]
+
+    def occupancy(self):
+        """Number of tracks currently inside each zone."""
+        return self.inside.sum(axis=0)
+
+    def occupants(self, zone):
+        z = self.zone_names.index(zone)
+        return [self.track_ids[s] for s in np.flatnonzero(self.inside[:, z])]
+
+    def entered(self, zone, since=None):
+        """(track_id, frame) of zone entries still in the event log."""
+        return [(e['track_id'], e['frame']) for e in self.events
+                if e['type'] == 'enter' and e['zone'] == zone and (since is None or e['frame'] >= since)]
+
+    def crossings(self, line, since=None):
+        """(track_id, frame, direction) of line crossings still in the event log."""
+        return [(e['track_id'], e['frame'], e['direction']) for e in self.events
+                if e['type'] == 'cross' and e['line'] == line and (since is None or e['frame'] >= since)]
+
+    def _ongoing(self, z):
+        slots = np.flatnonzero(self.inside[:, z])
+        return slots, self.last_inside[slots, z] - self.entered_at[slots, z] + 1
+
+    def dwell_frames(self, zone):
+        """Frames spent in `zone` per track still in the history, including ongoing visits."""
+        z = self.zone_names.index(zone)
+        dwell = self.dwell[:, z].copy()
+        slots, ongoing = self._ongoing(z)
+        dwell[slots] += ongoing
+        return {self.track_ids[s]: int(dwell[s]) for s in np.flatnonzero(dwell)}
+
+    def total_dwell_frames(self, zone):
+        """Frames spent in `zone` by all tracks since the start."""
+        z = self.zone_names.index(zone)
+        return int(self.zone_dwell[z] + self._ongoing(z)[1].sum())
+
+    def summary(self, fps=30):
+        zones = {}
+        for z, name in enumerate(self.zone_names):
+            entries = int(self.zone_entries[z])
+            dwell = self.total_dwell_frames(name) / fps
+            zones[name] = {
+                'entries': entries,
+                'occupancy': int(self.inside[:, z].sum()),
+                'dwell_seconds': round(dwell, 2),
+                'mean_dwell_seconds': round(dwell / entries, 2) if entries else 0.0,
+            }
+        return {
+            'frames': self.frame_idx + 1,
+            'active_tracks': len(self),
+            'dropped_tracks': self.dropped,
+            'zones': zones,
+            'lines': {
+                name: {'positive': int(self.line_counts[l, 1]), 'negative': int(self.line_counts[l, 0])}
+                for l, name in enumerate(self.line_names)
+            },
+        }
+
+    def dump(self, path, fps=30):
+        with open(path, 'w') as f:
+            json.dump({**self.summary(fps), 'events': list(self.events)}, f, indent=2)
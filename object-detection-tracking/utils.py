@@ -1,59 +1,116 @@
+import zlib
+from functools import lru_cache
 import cv2
 import numpy as np
 
 
+# Fixed palette so a track keeps its color without touching the global
+# NumPy random state on every frame.
+PALETTE = [tuple(int(c) for c in color)
+           for color in np.random.default_rng(0).integers(50, 255, (256, 3))]
+
+
+@lru_cache(maxsize=4096)
+def get_text_size(label, scale, thickness):
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
+
+
+@lru_cache(maxsize=2048)
+def render_label(label, color, text_color, scale, thickness=2):
+    """Pre-renders a filled label box so it can be pasted with one slice copy."""
+    text_w, text_h = get_text_size(label, scale, thickness)
+    sprite = np.empty((text_h + 10, text_w, 3), dtype=np.uint8)
+    sprite[:] = color
+    cv2.putText(sprite, label, (0, text_h + 5),
+                cv2.FONT_HERSHEY_SIMPLEX, scale, text_color, thickness)
+    sprite.setflags(write=False)
+    return sprite
+
+
+def paste_label(frame, x, y, sprite):
+    # The sprite's bottom-left corner sits at (x, y); clip it to the frame
+    h, w = sprite.shape[:2]
+    top = y - h
+    y0, y1 = max(top, 0), min(y, frame.shape[0])
+    x0, x1 = max(x, 0), min(x + w, frame.shape[1])
+    if y0 >= y1 or x0 >= x1:
+        return
+    frame[y0:y1, x0:x1] = sprite[y0 - top:y1 - top, x0 - x:x1 - x]
+
+
 def draw_detections(frame, detections):
     for det in detections:
         x1, y1, x2, y2 = det['bbox']
         conf = det['confidence']
         class_name = det['class']
-        
+
         cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-        
+
         label = f"{class_name}: {conf:.2f}"
-        text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-        cv2.rectangle(frame, (x1, y1 - text_size[1] - 10), 
-                     (x1 + text_size[0], y1), (0, 255, 0), -1)
-        cv2.putText(frame, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
-    
+        paste_label(frame, x1, y1, render_label(label, (0, 255, 0), (0, 0, 0), 0.5))
+
     return frame
 
 
-def draw_tracks(frame, tracked_objects, show_confidence=False):
+def draw_tracks(frame, tracked_objects, show_confidence=False, overlay_alpha=None):
+    """Draws boxes and ID labels for tracked objects.
+
+    With `overlay_alpha` set, all annotations are drawn onto one copy of the
+    frame and blended back in a single `addWeighted` call.
+    """
+    canvas = frame.copy() if overlay_alpha is not None else frame
+
     for obj in tracked_objects:
         x1, y1, x2, y2 = obj['bbox']
         track_id = obj['track_id']
         class_name = obj['class']
         confidence = obj.get('confidence', 0)
-        
+
         color = get_color_for_id(track_id)
-        
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-        
+
+        cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+
         if show_confidence:
             label = f"ID:{track_id} {class_name} {confidence:.2f}"
         else:
             label = f"ID:{track_id} {class_name}"
-        
-        text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-        cv2.rectangle(frame, (x1, y1 - text_size[1] - 10), 
-                     (x1 + text_size[0], y1), color, -1)
-        cv2.putText(frame, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-    
+
+        paste_label(canvas, x1, y1, render_label(label, color, (255, 255, 255), 0.6))
+
+    if overlay_alpha is not None:
+        cv2.addWeighted(canvas, overlay_alpha, frame, 1 - overlay_alpha, 0, dst=frame)
+
     return frame
 
 
+@lru_cache(maxsize=4096)
 def get_color_for_id(track_id):
-    track_id_int = int(track_id) if isinstance(track_id, str) else track_id
-    np.random.seed(track_id_int)
-    color = tuple(map(int, np.random.randint(50, 255, 3)))
-    return color
+    try:
+        index = int(track_id)
+    except (TypeError, ValueError):
+        index = zlib.crc32(str(track_id).encode())
+    return PALETTE[index % len(PALETTE)]
+
+
+def draw_zones(frame, history, color=(0, 200, 255)):
+    for name, polygon, count in zip(history.zone_names, history.zone_polygons, history.occupancy()):
+        points = polygon.astype(np.int32)
+        cv2.polylines(frame, [points], True, color, 2)
+        x, y = points.min(axis=0)
+        cv2.putText(frame, f"{name}: {count}", (int(x) + 5, int(y) + 20),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    
+    for name, line, (negative, positive) in zip(history.line_names, history.lines.astype(int),
+                                                history.line_counts):
+        cv2.line(frame, (line[0], line[1]), (line[2], line[3]), color, 2)
+        cv2.putText(frame, f"{name}: +{positive} / -{negative}", (int(line[0]) + 5, int(line[1]) + 20),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    
+    return frame
 
 
 def display_info(frame, fps, num_objects):
     info_text = f"FPS: {fps:.1f} | Objects: {num_objects}"
-    cv2.putText(frame, info_text, (10, 30), 
+    cv2.putText(frame, info_text, (10, 30),
                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-    return frame
\ No newline at end of file
+    return frame